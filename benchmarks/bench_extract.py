@@ -0,0 +1,46 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""
+# Benchmark: zipfile vs. extracted loads
+
+Compare `load(name, version)` against `load(name, version, extract=True)`.
+The dataset is downloaded and extracted before timing, so only loading is
+measured.
+
+## Usage
+
+```bash
+python benchmarks/bench_extract.py cora v0.0.6 --repeat 5
+```
+"""
+
+import argparse
+from timeit import repeat
+
+from relational_datasets import fetch
+from relational_datasets import load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("name")
+    parser.add_argument("version", nargs="?", default=None)
+    parser.add_argument("--fold", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    fetch(args.name, args.version, extract=True)
+
+    for extract in (False, True):
+        times = repeat(
+            lambda: load(args.name, args.version, fold=args.fold, extract=extract),
+            number=1,
+            repeat=args.repeat,
+        )
+        label = "extracted" if extract else "zipfile"
+        print(f"{label:>10}: best {min(times) * 1000:8.2f} ms of {args.repeat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""
+# Benchmark: archive formats
+
+Compare how fast each archive format (`deflate`, `stored`, and `zstd` when
+`zstandard` is installed) decodes a dataset, then optionally re-pack the
+cached archive into the fastest one.
+
+## Usage
+
+```bash
+python benchmarks/bench_formats.py cora v0.0.6 --repeat 5 --repack
+```
+"""
+
+import argparse
+import os
+
+from relational_datasets import fetch
+from relational_datasets.archive import benchmark
+from relational_datasets.archive import repack
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("name")
+    parser.add_argument("version", nargs="?", default=None)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--repack", action="store_true")
+    args = parser.parse_args()
+
+    data_file = fetch(args.name, args.version)
+    results = benchmark(data_file, repeat=args.repeat)
+    for format, rate in sorted(results.items(), key=lambda item: -item[1]):
+        print(f"{format:>8}: {rate:10.1f} MB/s")
+
+    if args.repack:
+        best = max(results, key=results.get)
+        packed = repack(data_file, best)
+        print(f"Re-packed as {best}: {packed} ({os.path.getsize(packed)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
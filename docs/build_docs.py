@@ -27,6 +27,8 @@ from urllib.request import urlopen
 TOKEN = environ["GH_TOKEN"]
 AUTHORIZATION = {"Authorization": f"token {TOKEN}"}
 
+RELEASES_URL = "https://api.github.com/repos/srlearn/datasets/releases?per_page=100"
+
 DATA_LOAD_RECOMMENDATION = """
 
 === "Python"
@@ -46,18 +48,43 @@ DATA_LOAD_RECOMMENDATION = """
 """
 
 
-def build_dataset_descriptions(latest_version: str):
-
-    req = Request(
-        "https://api.github.com/repos/srlearn/datasets/releases/latest",
-        headers=AUTHORIZATION,
-    )
+def get_catalog() -> dict:
+    """List every release and its assets with a single request.
 
+    This mirrors `relational_datasets.catalog._from_releases`, without
+    needing the package to be installed. Errors are raised, so a failed
+    request does not publish outdated pages.
+    """
+    req = Request(RELEASES_URL, headers={"Accept": "application/vnd.github+json", **AUTHORIZATION})
     with urlopen(req) as url:
-        latest = json.loads(url.read().decode("utf-8"))
-
-    for asset in latest["assets"]:
-        name = asset["name"].split("_v")[0]
+        releases = json.loads(url.read().decode("utf-8"))
+
+    versions = {}
+    latest = None
+    for release in sorted(releases, key=lambda r: r.get("published_at") or "", reverse=True):
+        if release.get("draft"):
+            continue
+        if latest is None and not release.get("prerelease"):
+            latest = release["tag_name"]
+        versions[release["tag_name"]] = {
+            "published_at": release["published_at"],
+            "assets": {
+                asset["name"].split("_v")[0].replace(".zip", ""): {
+                    "name": asset["name"],
+                    "size": asset["size"],
+                    "url": asset["browser_download_url"],
+                }
+                for asset in release.get("assets", [])
+            },
+        }
+    return {"latest": latest, "releases": versions}
+
+
+def build_dataset_descriptions(catalog: dict):
+
+    latest_version = catalog["latest"]
+
+    for name in catalog["releases"][latest_version]["assets"]:
 
         req = Request(
             f"https://raw.githubusercontent.com/srlearn/datasets/main/srlearn/{name}/README.md",
@@ -77,35 +104,15 @@ def build_dataset_descriptions(latest_version: str):
                 fh.write(line + "\n")
 
 
-def build_downloads_page() -> str:
-
-    req = Request(
-        "https://api.github.com/repos/srlearn/datasets/git/refs/tags",
-        headers=AUTHORIZATION,
-    )
-
-    with urlopen(req) as url:
-        all_tags = json.loads(url.read().decode("utf-8"))
-
-        # The response is formatted as {'ref': 'refs/tags/v0.0.1', ...}
-        # so we taken the last item after splitting on '/' to get version numbers.
-        all_versions = [tag["ref"].split("/")[-1] for tag in all_tags]
-        all_versions.reverse()
+def build_downloads_page(catalog: dict):
 
     markdown_string = "# Download Datasets\n\n"
     markdown_string += (
         "Download links for each dataset and version are listed here:\n\n"
     )
 
-    for version in all_versions:
-
-        req = Request(
-            f"https://api.github.com/repos/srlearn/datasets/releases/tags/{version}",
-            headers=AUTHORIZATION,
-        )
-
-        with urlopen(req) as url:
-            data = json.loads(url.read().decode("utf-8"))
+    # Releases in the catalog are ordered from newest to oldest.
+    for version, data in catalog["releases"].items():
 
         # I like timestamps
         stamp = datetime.fromisoformat(data["published_at"][:-1])
@@ -114,7 +121,7 @@ def build_downloads_page() -> str:
             f"## Version {version} ({stamp.year}-{stamp.month}-{stamp.day})\n\n"
         )
 
-        for asset in data["assets"]:
+        for asset in data["assets"].values():
 
             name = asset["name"]
 
@@ -125,7 +132,7 @@ def build_downloads_page() -> str:
             else:
                 size = round(_size / 1024, 2)
                 _unit = "KB"
-            url = asset["browser_download_url"]
+            url = asset["url"]
 
             markdown_string += f"- [{name}]({url}) ({size} {_unit})\n"
 
@@ -134,10 +141,8 @@ def build_downloads_page() -> str:
     with open("downloads.md", "w") as fh:
         fh.write(markdown_string)
 
-    # The first entry of `all_versions` should be the most recent one.
-    return all_versions[0]
-
 
 if __name__ == "__main__":
-    latest_version = build_downloads_page()
-    build_dataset_descriptions(latest_version)
+    catalog = get_catalog()
+    build_downloads_page(catalog)
+    build_dataset_descriptions(catalog)
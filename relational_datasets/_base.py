@@ -13,12 +13,17 @@
 Utility methods
 """
 
+import json
+import os
 from os import environ
 from os import makedirs
 from os.path import join
 from os.path import expanduser
+import pathlib
 import shutil
+from typing import Any
 from typing import Optional
+from typing import Union
 
 __all__ = ["get_data_home", "clear_data_home"]
 
@@ -47,3 +52,32 @@ def clear_data_home(data_home: Optional[str] = None) -> None:
     """
     data_home = get_data_home(data_home)
     shutil.rmtree(data_home)
+
+
+def _archive_stamp(path: Union[str, pathlib.Path]) -> str:
+    """Size and modification time of a file, used to notice when a cached
+    archive is replaced and anything derived from it is out of date.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}-{stat.st_mtime_ns}"
+
+
+def _read_json(path: Union[str, pathlib.Path], default: Any = None) -> Any:
+    """Read a JSON file, or return ``default`` if it is missing or invalid."""
+    try:
+        with open(path) as _fh:
+            return json.load(_fh)
+    except (OSError, ValueError):
+        return default
+
+
+def _write_json(path: Union[str, pathlib.Path], data: Any) -> None:
+    """Write a JSON file atomically: readers see the old or the new file,
+    never a partial one.
+    """
+    path = pathlib.Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial")
+    with open(partial, "w") as _fh:
+        json.dump(data, _fh, indent=1)
+    os.replace(partial, path)
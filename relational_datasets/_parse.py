@@ -0,0 +1,41 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Split ground atoms like ``friends(alice,bob).`` into predicates and arguments.
+"""
+
+import re
+from typing import Tuple
+
+__all__ = ["parse_atom", "format_atom"]
+
+_ATOM = re.compile(r"^\s*([^\s(]+)\((.*)\)\s*\.?\s*$")
+_ARG = re.compile(r'\s*("(?:[^"\\]|\\.)*"|[^,"()]+(?:\([^()]*\))?)\s*(?:,|$)')
+
+
+def parse_atom(line: str) -> Tuple[str, Tuple[str, ...]]:
+    """Return the predicate and arguments of a ground atom.
+
+    Raises:
+        ValueError: If ``line`` is not an atom.
+
+    Examples:
+
+    ```python
+    parse_atom("friends(alice,bob).")
+    # ('friends', ('alice', 'bob'))
+    ```
+    """
+    match = _ATOM.match(line)
+    if not match:
+        raise ValueError(f"Could not parse atom: {line!r}")
+    predicate, args = match.groups()
+    if '"' in args or "(" in args:
+        # Slow path: quoted strings and nested terms may contain commas.
+        return predicate, tuple(_ARG.findall(args))
+    return predicate, tuple(arg.strip() for arg in args.split(","))
+
+
+def format_atom(predicate: str, args: Tuple[str, ...]) -> str:
+    """Inverse of `parse_atom`."""
+    return f"{predicate}({','.join(args)})."
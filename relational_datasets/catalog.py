@@ -0,0 +1,210 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""A local catalog of `srlearn/datasets` releases.
+
+The catalog lists every release with its datasets, archive sizes, and
+download links. It is stored as `catalog.json` in the data home, and
+revalidated against GitHub's REST API at most once per `ttl` seconds using a
+conditional (`If-None-Match`) request. Conditional requests answered with
+`304 Not Modified` do not count against GitHub's rate limit. When GitHub
+cannot be reached (or the rate limit is exceeded), the last known catalog is
+used, and GitHub is not asked again for `RETRY_AFTER` seconds.
+"""
+
+import json
+import pathlib
+import time
+from typing import Dict
+from typing import List
+from typing import Optional
+from urllib.error import HTTPError
+from urllib.error import URLError
+from urllib.request import Request
+from urllib.request import urlopen
+from zipfile import ZipFile
+
+from ._base import _read_json
+from ._base import _write_json
+from ._base import get_data_home
+from .request import DATASETS
+from .request import LATEST_VERSION
+from .request import _n_folds
+from .request import fetch
+
+__all__ = ["get_catalog", "list_versions", "list_datasets", "n_folds"]
+
+RELEASES_URL = "https://api.github.com/repos/srlearn/datasets/releases?per_page=100"
+
+# Revalidate the catalog once a day by default.
+DEFAULT_TTL = 24 * 60 * 60
+
+# Seconds to wait for GitHub before falling back to the local catalog.
+TIMEOUT = 10
+
+# Seconds to wait after a failed revalidation before trying again.
+RETRY_AFTER = 10 * 60
+
+
+def _catalog_path() -> pathlib.Path:
+    return pathlib.Path(get_data_home()).joinpath("catalog.json")
+
+
+def get_catalog(
+    *,
+    ttl: float = DEFAULT_TTL,
+    refresh: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> dict:
+    """Return the catalog, revalidating it with GitHub if it is older than ``ttl``.
+
+    Arguments:
+        ttl: Seconds before the local catalog is revalidated.
+        refresh: Revalidate now, regardless of ``ttl``, and raise if that fails.
+        headers: Extra request headers, e.g. `{"Authorization": "token ..."}`.
+
+    Returns:
+        A dictionary with the `latest` version, and `releases` mapping each
+        version to its `published_at` timestamp and `assets`. Each asset
+        (keyed by dataset name) has an archive `name`, `size`, and `url`.
+
+    Raises:
+        urllib.error.URLError: With ``refresh=True``, if GitHub cannot be
+            reached or answers with an error (e.g. when rate limited).
+
+    Examples:
+
+    ```python
+    from relational_datasets.catalog import get_catalog
+
+    catalog = get_catalog()
+    catalog["latest"]
+    # 'v0.0.6'
+    catalog["releases"]["v0.0.6"]["assets"]["cora"]["size"]
+    # 1003436
+    ```
+    """
+    path = _catalog_path()
+    catalog = _read_json(path)
+
+    if catalog is not None and not refresh:
+        now = time.time()
+        if now - catalog["checked_at"] < ttl or now - catalog.get("failed_at", 0) < RETRY_AFTER:
+            return catalog
+
+    request_headers = {"Accept": "application/vnd.github+json"}
+    request_headers.update(headers or {})
+    if catalog is not None and catalog.get("etag"):
+        request_headers["If-None-Match"] = catalog["etag"]
+
+    try:
+        with urlopen(Request(RELEASES_URL, headers=request_headers), timeout=TIMEOUT) as url:
+            releases = json.loads(url.read().decode("utf-8"))
+            etag = url.headers.get("ETag")
+    except HTTPError as error:
+        if error.code == 304 and catalog is not None:
+            catalog["checked_at"] = time.time()
+            catalog.pop("failed_at", None)
+            _write_json(path, catalog)
+            return catalog
+        if refresh:
+            raise
+        return _record_failure(path, catalog)
+    except (URLError, OSError, ValueError):
+        if refresh:
+            raise
+        return _record_failure(path, catalog)
+
+    updated = _from_releases(releases)
+    updated["etag"] = etag
+    updated["checked_at"] = time.time()
+    updated["folds"] = catalog.get("folds", {}) if catalog is not None else {}
+    _write_json(path, updated)
+    return updated
+
+
+def list_versions(**kwargs) -> List[str]:
+    """List released versions, newest first. Keyword arguments are passed to `get_catalog`."""
+    return list(get_catalog(**kwargs)["releases"])
+
+
+def list_datasets(version: Optional[str] = None, **kwargs) -> List[str]:
+    """List the datasets in a version (default: the latest one).
+
+    Keyword arguments are passed to `get_catalog`.
+    """
+    catalog = get_catalog(**kwargs)
+    release = catalog["releases"].get(version or catalog["latest"], {"assets": {}})
+    return list(release["assets"])
+
+
+def n_folds(name: str, version: Optional[str] = None) -> int:
+    """Number of folds in a cached archive (`0` when there is one train/test split).
+
+    The count is read from the archive the first time, and remembered in the
+    catalog afterwards.
+    """
+    data_file = fetch(name, version)
+    key = pathlib.Path(data_file).stem
+
+    path = _catalog_path()
+    catalog = _read_json(path) or _fallback_catalog()
+    if key in catalog["folds"]:
+        return catalog["folds"][key]
+
+    with ZipFile(data_file) as myzip:
+        folds = _n_folds(myzip)
+
+    # Re-read in case the catalog was revalidated in the meantime.
+    catalog = _read_json(path) or _fallback_catalog()
+    catalog["folds"][key] = folds
+    _write_json(path, catalog)
+    return folds
+
+
+def _record_failure(path: pathlib.Path, catalog: Optional[dict]) -> dict:
+    """Keep using ``catalog`` (or the fallback), and back off before asking again."""
+    if catalog is None:
+        catalog = _fallback_catalog()
+    catalog["failed_at"] = time.time()
+    _write_json(path, catalog)
+    return catalog
+
+
+def _from_releases(releases: List[dict]) -> dict:
+    """Build a catalog from the GitHub "list releases" response."""
+    versions = {}
+    latest = None
+    for release in sorted(releases, key=lambda r: r.get("published_at") or "", reverse=True):
+        if release.get("draft"):
+            continue
+        if latest is None and not release.get("prerelease"):
+            latest = release["tag_name"]
+        versions[release["tag_name"]] = {
+            "published_at": release.get("published_at"),
+            "assets": {
+                asset["name"].split("_v")[0].replace(".zip", ""): {
+                    "name": asset["name"],
+                    "size": asset["size"],
+                    "url": asset["browser_download_url"],
+                }
+                for asset in release.get("assets", [])
+            },
+        }
+    return {"latest": latest or LATEST_VERSION, "releases": versions}
+
+
+def _fallback_catalog() -> dict:
+    """The versions and datasets known to this package, without sizes."""
+    return {
+        "latest": LATEST_VERSION,
+        "releases": {
+            LATEST_VERSION: {
+                "published_at": None,
+                "assets": {name: {} for name in DATASETS},
+            }
+        },
+        "etag": None,
+        "checked_at": 0,
+        "folds": {},
+    }
@@ -5,3 +5,5 @@
 """
 
 from .convert_numpy import from_numpy
+from .convert_numpy import to_numpy
+from .convert_pandas import from_pandas
@@ -1,10 +1,11 @@
 # Copyright © 2021 Alexander L. Hayes
 # Apache 2.0 License
 
-"""Convert vector-based ML datasets to tuple-based ILP datasets.
+"""Convert vector-based ML datasets to tuple-based ILP datasets, and back.
 """
 
-from typing import List, Tuple, Optional
+import re
+from typing import Dict, List, Tuple, Optional
 
 import numpy as np
 
@@ -103,3 +104,214 @@ def from_numpy(X: np.ndarray, y: np.ndarray, names: Optional[List[str]] = None)
         modes += [f"{names[-1]}(+id)."]
 
     return RelationalDataset(pos=pos, neg=neg, facts=facts), modes
+
+
+# `pred(id).` or `pred(id,value).`, other arities are skipped by `to_numpy`.
+_FACT = re.compile(r"^\s*([^\s(,]+)\(([^\s(),]+)(?:,([^\s(),]+))?\)\.?\s*$", re.MULTILINE)
+_REGRESSION = re.compile(r"^\s*regressionExample\(([^\s(,]+)\(([^\s(),]+)\),([^\s(),]+)\)\.?\s*$", re.MULTILINE)
+_ROW_ID = re.compile(r"id(\d+)")
+
+
+def _parse_facts(lines: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse unary and binary atoms in bulk, returning predicate, first
+    argument, and value arrays. Unary atoms have an empty value.
+    """
+    matches = _FACT.findall("\n".join(lines))
+    if not matches:
+        empty = np.array([], dtype=str)
+        return empty, empty, empty
+    preds, ids, values = np.array(matches, dtype=str).T
+    return preds, ids, values
+
+
+def _decode_values(preds: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, Dict[str, Dict[int, str]]]:
+    """Turn `pred_value` strings into integers.
+
+    Each distinct (predicate, value) pair is decoded once. Values written by
+    `from_numpy` (e.g. `v1_2` for `v1`) decode to the original integer.
+    Predicates with any other values use codes: `1 + ` the rank of each value
+    among the sorted values of that predicate, so that no code is `0`. Unary
+    atoms decode to `1`.
+
+    Returns the decoded values, and a codebook mapping codes back to values
+    for each coded predicate.
+    """
+    # Parsed atoms contain no whitespace, so a space separates the pair.
+    keys, inverse = np.unique(np.char.add(np.char.add(preds, " "), values), return_inverse=True)
+    pairs = [key.split(" ") for key in keys.tolist()]
+
+    decoded = {}
+    codebooks = {}
+    for pred, value in pairs:
+        decoded.setdefault(pred, {})[value] = None
+
+    for pred, codebook in decoded.items():
+        try:
+            for value in codebook:
+                if value == "":
+                    codebook[value] = 1
+                elif value.startswith(pred + "_"):
+                    codebook[value] = int(value[len(pred) + 1 :])
+                else:
+                    codebook[value] = int(value)
+        except ValueError:
+            codebooks[pred] = {}
+            for code, value in enumerate(sorted(codebook), start=1):
+                codebook[value] = code
+                codebooks[pred][code] = value
+
+    table = np.array([decoded[pred][value] for pred, value in pairs], dtype=np.int64)
+    return table[inverse.reshape(-1)], codebooks
+
+
+def _row_order(ids: List[str]) -> List[str]:
+    """Order examples by `idN` when every id has that form (as written by
+    `from_numpy`), otherwise by first appearance.
+    """
+    ids = list(dict.fromkeys(ids))
+    if all(_ROW_ID.fullmatch(i) for i in ids):
+        ids.sort(key=lambda i: int(i[2:]))
+    return ids
+
+
+def to_numpy(
+    data: RelationalDataset, *, sparse: bool = False
+) -> Tuple[np.ndarray, np.ndarray, List[str], Dict[str, Dict[int, str]]]:
+    """Convert a RelationalDataset to a covariate matrix (`X`) and target (`y`).
+
+    This is the inverse of `from_numpy`. Each row is an example, and each
+    predicate in `facts` becomes a column:
+
+    - `pred(id,value).` stores `value` in column `pred`.
+    - `pred(id).` stores `1` in column `pred`.
+
+    Values are decoded as described in `from_numpy` (`v1_2` → `2`). Columns
+    with other values are ordinal-encoded by the sorted order of their values,
+    starting from `1`, and their codebooks are returned. Missing cells are
+    `0`, and if an example has several values for a predicate then the last
+    one is kept. Facts about constants that are not examples are ignored.
+
+    The target is inferred from the examples:
+
+    - `target(id).` in `pos`/`neg`: classification, `y` is 1 or 0
+    - `target(id,target_k).`: multiclass classification, `y` is `k` (or a
+      code, when the labels are not integers)
+    - `regressionExample(target(id),value).`: regression, `y` is a float
+
+    Arguments:
+        data: Examples and facts to convert
+        sparse: Return `X` as a `scipy.sparse.csr_matrix` (requires `scipy`)
+
+    Returns:
+        Tuple of `X`, `y`, the variable names (the last one is the target),
+            and the codebooks: for each ordinal-encoded variable, a dictionary
+            mapping codes to the original values.
+
+    Raises:
+        ValueError: When the examples are not in one of the forms above.
+
+    Examples:
+
+    Round-trip a binary classification problem through `from_numpy`:
+
+    ```python
+    from relational_datasets.convert import from_numpy, to_numpy
+    import numpy as np
+
+    data, modes = from_numpy(
+      np.array([[0, 1, 1], [0, 1, 2], [1, 2, 2]]),
+      np.array([0, 0, 1]),
+    )
+    X, y, names, codebooks = to_numpy(data)
+    # X: array([[0, 1, 1], [0, 1, 2], [1, 2, 2]])
+    # y: array([0, 0, 1])
+    # names: ['v1', 'v2', 'v3', 'v4']
+    # codebooks: {}
+    ```
+
+    Non-integer values are encoded, and can be decoded with the codebooks:
+
+    ```python
+    from relational_datasets.convert import to_numpy
+    from relational_datasets.types import RelationalDataset
+
+    X, y, names, codebooks = to_numpy(
+        RelationalDataset(
+            pos=["cancer(alice)."],
+            neg=["cancer(bob)."],
+            facts=["color(alice,red).", "color(bob,blue)."],
+        )
+    )
+    # X: array([[2], [1]])
+    # codebooks: {'color': {1: 'blue', 2: 'red'}}
+    ```
+    """
+
+    regression = _REGRESSION.findall("\n".join(data.pos))
+    codebooks = {}  # type: Dict[str, Dict[int, str]]
+
+    if regression:
+        if data.neg or len(regression) != len(data.pos):
+            raise ValueError("Regression examples should all be in `pos`.")
+        targets, example_ids, labels = np.array(regression, dtype=str).T
+        y_values = labels.astype(float)
+    else:
+        targets, example_ids, labels = _parse_facts(list(data.pos) + list(data.neg))
+        if targets.size != len(data.pos) + len(data.neg):
+            raise ValueError("Examples should be unary or binary atoms.")
+        if np.all(labels == ""):
+            y_values = np.zeros(targets.size, dtype=np.int64)
+            y_values[: len(data.pos)] = 1
+        else:
+            if data.neg:
+                raise ValueError("Multiclass examples should all be in `pos`.")
+            y_values, codebooks = _decode_values(targets, labels)
+
+    if np.unique(targets).size != 1:
+        raise ValueError("Examples should all have the same target predicate.")
+
+    rows = _row_order(example_ids.tolist())
+    row_index = {example: i for i, example in enumerate(rows)}
+
+    y = np.zeros(len(rows), dtype=y_values.dtype)
+    y[[row_index[i] for i in example_ids.tolist()]] = y_values
+
+    preds, fact_ids, values = _parse_facts(data.facts)
+
+    # Map fact ids to rows once per distinct id.
+    unique_ids, id_inverse = np.unique(fact_ids, return_inverse=True)
+    id_rows = np.array([row_index.get(i, -1) for i in unique_ids.tolist()], dtype=np.int64)
+    fact_rows = id_rows[id_inverse.reshape(-1)] if fact_ids.size else np.array([], dtype=np.int64)
+    keep = fact_rows >= 0
+    preds, fact_rows, values = preds[keep], fact_rows[keep], values[keep]
+
+    # Columns are ordered by first appearance, matching `from_numpy`.
+    unique_preds, first, pred_inverse = np.unique(preds, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    position = np.empty_like(order)
+    position[order] = np.arange(order.size)
+    fact_cols = position[pred_inverse.reshape(-1)]
+    names = unique_preds[order].tolist() + [str(targets[0])]
+
+    if preds.size:
+        cell_values, fact_codebooks = _decode_values(preds, values)
+        codebooks.update(fact_codebooks)
+    else:
+        cell_values = np.array([], dtype=np.int64)
+
+    # Keep the last value written to each cell.
+    shape = (len(rows), len(names) - 1)
+    cells = fact_rows * shape[1] + fact_cols
+    _, last = np.unique(cells[::-1], return_index=True)
+    last = cells.size - 1 - last
+    fact_rows, fact_cols, cell_values = fact_rows[last], fact_cols[last], cell_values[last]
+
+    if sparse:
+        from scipy.sparse import csr_matrix
+
+        X = csr_matrix((cell_values, (fact_rows, fact_cols)), shape=shape, dtype=np.int64)
+    else:
+        X = np.zeros(shape, dtype=np.int64)
+        X[fact_rows, fact_cols] = cell_values
+
+    return X, y, names, {name: codebooks[name] for name in names if name in codebooks}
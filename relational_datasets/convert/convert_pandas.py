@@ -0,0 +1,150 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Convert frame-based ML datasets to tuple-based ILP datasets.
+"""
+
+import re
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+
+from ..types import RelationalDataset
+from .convert_numpy import _get_task
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Characters that would change the structure of an atom.
+_UNSAFE = re.compile(r"[\s,()'\"]")
+
+
+def _format_column(var: str, ids: np.ndarray, column: "pd.Series", template: str) -> List[str]:
+    """Format one atom per non-missing row of ``column``.
+
+    Each distinct value is formatted once with ``template`` (e.g.
+    ``",{var}_{value})."``), then joined to the row ids by its code.
+
+    Raises:
+        ValueError: When a value contains whitespace, commas, parentheses, or
+            quotes, which cannot appear in a constant.
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(column, sort=False)
+    for value in uniques:
+        if _UNSAFE.search(str(value)):
+            raise ValueError(f"Value {value!r} in column {var!r} cannot be used as a constant.")
+    suffixes = np.array(
+        [template.format(var=var, value=value) for value in uniques], dtype=str
+    )
+    present = codes >= 0
+    if not present.all():
+        ids, codes = ids[present], codes[present]
+    return np.char.add(ids, suffixes[codes]).tolist()
+
+
+def from_pandas(
+    data: "pd.DataFrame", target: Optional[str] = None
+) -> Tuple[RelationalDataset, List[str]]:
+    """Convert a pandas DataFrame to a RelationalDataset with modes.
+
+    Column names are used as predicate names, and the rows are named `id1`,
+    `id2`, ... as in `from_numpy`. Integer, float, boolean, categorical, and
+    string columns are supported: every distinct value in a column is formatted
+    once, and missing values produce no fact. For integer data the result is
+    identical to `from_numpy`. Values must not contain whitespace, commas,
+    parentheses, or quotes.
+
+    The type of the target column decides the task:
+
+    - `bool`, or integer with two values: classification
+    - integer with more values, `category`, or strings: multiclass classification
+    - `float`: regression
+
+    Nullable integer and boolean columns (`Int64`, `boolean`) are treated like
+    `int` and `bool`. The target column cannot have missing values.
+
+    Arguments:
+        data: DataFrame of covariates and the target variable
+        target: Name of the target column. Defaults to the last column.
+
+    Returns:
+        Tuple of `RelationalDataset` and a list of strings containing the modes
+
+    Raises:
+        TypeError: When classification vs. regression cannot be determined from
+            the type of the target column.
+        ValueError: When the target column has missing values, or a value
+            cannot be used as a constant.
+
+    Examples:
+
+    ```python
+    from relational_datasets.convert import from_pandas
+    import pandas as pd
+
+    data, modes = from_pandas(
+        pd.DataFrame({
+            "color": pd.Categorical(["red", "blue", "red"]),
+            "size": [1, 2, 2],
+            "label": [0, 0, 1],
+        })
+    )
+    # data.facts[0] == 'color(id1,color_red).'
+    ```
+    """
+    import pandas as pd
+
+    if target is None:
+        target = data.columns[-1]
+    target = str(target)
+    data = data.rename(columns=str)
+
+    y = data[target]
+    covariates = [str(name) for name in data.columns if name != target]
+
+    if y.isna().any():
+        raise ValueError(f"Target column {target!r} has missing values.")
+
+    if pd.api.types.is_bool_dtype(y):
+        _task = "classification"
+    elif isinstance(y.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(y):
+        _task = "multiclass-classification"
+    elif pd.api.types.is_integer_dtype(y):
+        # Nullable integers would otherwise become floats.
+        _task = _get_task(y.to_numpy(dtype=np.int64))
+    else:
+        _task = _get_task(y.to_numpy())
+
+    # Row identifiers are formatted once and shared by every column.
+    row_ids = np.array([f"id{i}" for i in range(1, len(data) + 1)], dtype=str)
+
+    pos, neg, facts = [], [], []
+
+    if _task == "classification":
+        labels = y.to_numpy(dtype=bool)
+        atoms = np.char.add(np.char.add(f"{target}(", row_ids), ").")
+        pos = atoms[labels].tolist()
+        neg = atoms[~labels].tolist()
+
+    elif _task == "multiclass-classification":
+        ids = np.char.add(f"{target}(", row_ids)
+        pos = _format_column(target, ids, y, ",{var}_{value}).")
+
+    else:
+        # _task == "regression"
+        ids = np.char.add(f"regressionExample({target}(", row_ids)
+        pos = _format_column(target, ids, y, "),{value}).")
+
+    for var in covariates:
+        ids = np.char.add(f"{var}(", row_ids)
+        facts += _format_column(var, ids, data[var], ",{var}_{value}).")
+
+    modes = [f"{name}(+id,#var{name})." for name in covariates]
+    if _task == "multiclass-classification":
+        modes += [f"{target}(+id,#classlabel)."]
+    else:
+        modes += [f"{target}(+id)."]
+
+    return RelationalDataset(pos=pos, neg=neg, facts=facts), modes
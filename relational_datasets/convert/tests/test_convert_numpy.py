@@ -9,6 +9,8 @@ import pytest
 numpy = pytest.importorskip("numpy")
 
 from relational_datasets.convert import from_numpy
+from relational_datasets.convert import to_numpy
+from relational_datasets.types import RelationalDataset
 
 
 def test_convert_numpy_classification():
@@ -113,3 +115,66 @@ def test_convert_multiclass():
         "v3(+id,#varv3).",
         "v4(+id,#classlabel).",
     ]
+
+
+@pytest.mark.parametrize(
+    "y",
+    [
+        numpy.array([0, 0, 1, 1]),
+        numpy.array([0, 0, 1, 2]),
+        numpy.array([0.1, 0.2, 0.3, 0.4]),
+    ],
+)
+def test_to_numpy_round_trip(y):
+    """Test that `to_numpy` inverts `from_numpy`."""
+    X = numpy.array([[0, 1, 1], [1, 0, 2], [2, 2, 0], [1, 1, 1]])
+    data, _ = from_numpy(X, y, names=["a", "b", "c", "target"])
+    X_out, y_out, names, codebooks = to_numpy(data)
+
+    assert numpy.array_equal(X_out, X)
+    assert numpy.array_equal(y_out, y)
+    assert names == ["a", "b", "c", "target"]
+    assert codebooks == {}
+
+
+def test_to_numpy_sparse():
+    """Test building a sparse `X` matrix."""
+    pytest.importorskip("scipy")
+    X = numpy.array([[0, 1, 1], [1, 0, 2], [2, 2, 0], [1, 1, 1]])
+    data, _ = from_numpy(X, numpy.array([0, 0, 1, 1]))
+    X_out, _, _, _ = to_numpy(data, sparse=True)
+    assert numpy.array_equal(X_out.toarray(), X)
+
+
+def test_to_numpy_codes_and_unary_facts():
+    """Test encoding non-integer values and unary predicates."""
+    data = RelationalDataset(
+        pos=["cancer(alice).", "cancer(bob)."],
+        neg=["cancer(chuck)."],
+        facts=[
+            "smokes(bob).",
+            "color(alice,red).",
+            "color(bob,blue).",
+            "color(chuck,red).",
+            "friends(dan,alice).",
+        ],
+    )
+    X, y, names, codebooks = to_numpy(data)
+    assert names == ["smokes", "color", "cancer"]
+    # Codes start at 1, so `blue` differs from a missing value.
+    assert X.tolist() == [[0, 2], [1, 1], [0, 2]]
+    assert y.tolist() == [1, 1, 0]
+    assert codebooks == {"color": {1: "blue", 2: "red"}}
+
+
+def test_to_numpy_multiclass_codebook():
+    """Test encoding non-integer multiclass labels."""
+    data = RelationalDataset(
+        pos=["species(id1,species_setosa).", "species(id2,species_virginica)."],
+        neg=[],
+        facts=["petal(id1,petal_1).", "petal(id2,petal_3)."],
+    )
+    X, y, names, codebooks = to_numpy(data)
+    assert X.tolist() == [[1], [3]]
+    assert y.tolist() == [1, 2]
+    assert codebooks == {"species": {1: "species_setosa", 2: "species_virginica"}}
@@ -0,0 +1,88 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the `convert_pandas` module
+"""
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+pandas = pytest.importorskip("pandas")
+
+from relational_datasets.convert import from_numpy
+from relational_datasets.convert import from_pandas
+
+
+@pytest.mark.parametrize(
+    "y",
+    [
+        numpy.array([0, 0, 1, 1]),
+        numpy.array([0, 0, 1, 2]),
+        numpy.array([0.1, 0.2, 0.3, 0.4]),
+    ],
+)
+def test_from_pandas_matches_from_numpy(y):
+    """Test that integer frames convert exactly like `from_numpy`."""
+    X = numpy.array([[0, 1, 1], [1, 0, 2], [2, 2, 0], [1, 1, 1]])
+    frame = pandas.DataFrame(X, columns=["v1", "v2", "v3"])
+    frame["v4"] = y
+    assert from_pandas(frame) == from_numpy(X, y)
+
+
+def test_from_pandas_mixed_dtypes():
+    """Test categorical, float, and missing values with a named target."""
+    frame = pandas.DataFrame(
+        {
+            "smokes": [True, False, True],
+            "color": pandas.Categorical(["red", "blue", None]),
+            "weight": [1.5, numpy.nan, 2.0],
+            "species": ["cat", "dog", "cat"],
+        }
+    )
+    data, modes = from_pandas(frame, target="smokes")
+
+    assert data.pos == ["smokes(id1).", "smokes(id3)."]
+    assert data.neg == ["smokes(id2)."]
+    assert data.facts == [
+        "color(id1,color_red).",
+        "color(id2,color_blue).",
+        "weight(id1,weight_1.5).",
+        "weight(id3,weight_2.0).",
+        "species(id1,species_cat).",
+        "species(id2,species_dog).",
+        "species(id3,species_cat).",
+    ]
+    assert modes == [
+        "color(+id,#varcolor).",
+        "weight(+id,#varweight).",
+        "species(+id,#varspecies).",
+        "smokes(+id).",
+    ]
+
+
+def test_from_pandas_categorical_target():
+    """Test that a categorical target is a multiclass problem."""
+    frame = pandas.DataFrame({"x": [1, 2], "label": pandas.Categorical(["a", "b"])})
+    data, modes = from_pandas(frame)
+    assert data.pos == ["label(id1,label_a).", "label(id2,label_b)."]
+    assert modes[-1] == "label(+id,#classlabel)."
+
+
+def test_from_pandas_nullable_target():
+    """Test that nullable integer targets keep their task."""
+    frame = pandas.DataFrame({"x": [1, 2, 3], "t": pandas.array([1, 0, 1], dtype="Int64")})
+    data, _ = from_pandas(frame)
+    assert data.pos == ["t(id1).", "t(id3)."]
+    assert data.neg == ["t(id2)."]
+
+    frame["t"] = pandas.array([1, None, 1], dtype="Int64")
+    with pytest.raises(ValueError):
+        from_pandas(frame)
+
+
+@pytest.mark.parametrize("value", ["q,r", "x y", "f(x)", "it's", '"a"'])
+def test_from_pandas_unsafe_values(value):
+    """Test that values which would break an atom are rejected."""
+    frame = pandas.DataFrame({"a": ["ok", value], "label": [0, 1]})
+    with pytest.raises(ValueError):
+        from_pandas(frame)
@@ -0,0 +1,200 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Export binary predicates (e.g. `cites(a,b)`) as sparse adjacency matrices.
+"""
+
+import os
+import pathlib
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ._base import _archive_stamp
+from .request import fetch
+from .request import load
+
+__all__ = ["RelationalGraph", "to_graph", "load_graph"]
+
+_BINARY = re.compile(r"^\s*([^\s(,]+)\(([^\s(),]+),([^\s(),]+)\)\.?\s*$", re.MULTILINE)
+
+
+class RelationalGraph(NamedTuple):
+    constants: List[str]
+    indptr: Dict[str, np.ndarray]
+    indices: Dict[str, np.ndarray]
+
+    def to_scipy(self) -> dict:
+        """Return a `scipy.sparse.csr_matrix` for each predicate (requires `scipy`,
+        e.g. `pip install relational-datasets[graph]`).
+        """
+        from scipy.sparse import csr_matrix
+
+        n = len(self.constants)
+        return {
+            predicate: csr_matrix(
+                (np.ones(indices.size, dtype=np.int8), indices, self.indptr[predicate]),
+                shape=(n, n),
+            )
+            for predicate, indices in self.indices.items()
+        }
+
+
+RelationalGraph.__doc__ = """
+```python
+RelationalGraph(constants: List[str], indptr: Dict[str, np.ndarray], indices: Dict[str, np.ndarray])
+```
+
+One graph per binary predicate in compressed sparse row (CSR) form, over a
+shared set of nodes. Node `i` is the constant `constants[i]`. For a
+predicate `p`, the edges leaving node `i` point to the nodes
+`indices[p][indptr[p][i]:indptr[p][i + 1]]`.
+"""
+
+
+def to_graph(facts: Sequence[str], predicates: Optional[Iterable[str]] = None) -> RelationalGraph:
+    """Build CSR adjacency arrays for binary predicates.
+
+    All facts are parsed with a single regular expression, constants are
+    mapped to dense integer ids with `np.unique`, and edges are grouped by
+    predicate and source with one sort.
+
+    Arguments:
+        facts: Facts, e.g. `train.facts` from `load`. Facts that are not
+            binary atoms are ignored.
+        predicates: Only export these predicates. Defaults to every binary
+            predicate.
+
+    Returns:
+        A `RelationalGraph`. Node ids are assigned to constants in sorted order.
+
+    Examples:
+
+    ```python
+    from relational_datasets.graph import to_graph
+
+    graph = to_graph(["cites(a,b).", "cites(a,c).", "cites(c,a)."])
+    graph.constants
+    # ['a', 'b', 'c']
+    graph.indptr["cites"], graph.indices["cites"]
+    # (array([0, 2, 2, 3]), array([1, 2, 0]))
+    ```
+    """
+    matches = _BINARY.findall("\n".join(facts))
+    if matches:
+        preds, sources, targets = np.array(matches, dtype=str).T
+    else:
+        preds = sources = targets = np.array([], dtype=str)
+
+    if predicates is not None:
+        keep = np.isin(preds, list(predicates))
+        preds, sources, targets = preds[keep], sources[keep], targets[keep]
+
+    constants, ids = np.unique(np.concatenate([sources, targets]), return_inverse=True)
+    ids = ids.reshape(-1)
+    n = constants.size
+    sources, targets = ids[: preds.size], ids[preds.size :]
+
+    names, pred_ids = np.unique(preds, return_inverse=True)
+    pred_ids = pred_ids.reshape(-1)
+    order = np.lexsort((targets, sources, pred_ids))
+    sources, targets, pred_ids = sources[order], targets[order], pred_ids[order]
+    bounds = np.searchsorted(pred_ids, np.arange(names.size + 1))
+
+    indptr = {}
+    indices = {}
+    for i, name in enumerate(names.tolist()):
+        start, stop = bounds[i], bounds[i + 1]
+        counts = np.bincount(sources[start:stop], minlength=n)
+        indptr[name] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        indices[name] = targets[start:stop].astype(np.int64)
+
+    return RelationalGraph(constants.tolist(), indptr, indices)
+
+
+def load_graph(
+    name: str,
+    version: Optional[str] = None,
+    *,
+    fold: int = 1,
+    split: str = "train",
+    predicates: Optional[Iterable[str]] = None,
+) -> RelationalGraph:
+    """Build (or reuse) the graph for the facts of a dataset.
+
+    The graph is saved to `{name}_{version}.fold{fold}.{split}.graph.npz`
+    next to the archive, so later calls only read the arrays back. The cache
+    is rebuilt if the archive changes.
+
+    Arguments:
+        name: Dataset name (e.g. `cora`)
+        version: Dataset version (e.g. `v0.0.6`)
+        fold: In datasets with multiple folds, use this fold.
+        split: Either `train` or `test`.
+        predicates: Only export these predicates.
+
+    Returns:
+        A `RelationalGraph` for the facts in the split.
+
+    Examples:
+
+    ```python
+    from relational_datasets.graph import load_graph
+
+    graph = load_graph("cora", predicates=["cites"])
+    adjacency = graph.to_scipy()["cites"]
+    ```
+    """
+    if split not in ("train", "test"):
+        raise ValueError(f"split must be 'train' or 'test', not {split!r}")
+
+    data_file = pathlib.Path(fetch(name, version))
+    stamp = _archive_stamp(data_file)
+    wanted = sorted(set(predicates)) if predicates is not None else None
+    cache_file = data_file.with_suffix(f".fold{fold}.{split}.graph.npz")
+
+    graph = _read_graph(cache_file, stamp)
+    if graph is None:
+        train, test = load(name, version, fold=fold)
+        facts = train.facts if split == "train" else test.facts
+        graph = to_graph(facts)
+        _write_graph(cache_file, graph, stamp)
+
+    if wanted is None:
+        return graph
+    return RelationalGraph(
+        graph.constants,
+        {p: graph.indptr[p] for p in wanted if p in graph.indptr},
+        {p: graph.indices[p] for p in wanted if p in graph.indices},
+    )
+
+
+def _read_graph(path: pathlib.Path, stamp: str) -> Optional[RelationalGraph]:
+    try:
+        with np.load(path, allow_pickle=False) as arrays:
+            if arrays["stamp"].item() != stamp:
+                return None
+            names = arrays["predicates"].tolist()
+            return RelationalGraph(
+                arrays["constants"].tolist(),
+                {p: arrays[f"indptr_{i}"] for i, p in enumerate(names)},
+                {p: arrays[f"indices_{i}"] for i, p in enumerate(names)},
+            )
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _write_graph(path: pathlib.Path, graph: RelationalGraph, stamp: str) -> None:
+    arrays = {
+        "stamp": np.array(stamp),
+        "constants": np.array(graph.constants, dtype=str),
+        "predicates": np.array(list(graph.indptr), dtype=str),
+    }
+    for i, predicate in enumerate(graph.indptr):
+        arrays[f"indptr_{i}"] = graph.indptr[predicate]
+        arrays[f"indices_{i}"] = graph.indices[predicate]
+
+    partial = path.with_name(f"{path.name}.{os.getpid()}.partial.npz")
+    np.savez(partial, **arrays)
+    os.replace(partial, path)
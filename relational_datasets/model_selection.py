@@ -0,0 +1,218 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Split a loaded dataset into cross-validation folds.
+"""
+
+from array import array
+import random
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from zlib import crc32
+
+from ._base import _read_json
+from ._base import _write_json
+from ._parse import parse_atom
+from .types import RelationalDataset
+
+__all__ = ["assign_folds", "kfold"]
+
+
+class _IndexView(Sequence[str]):
+    """A read-only list of ``items[i] for i in index``, which shares the
+    strings in ``items`` instead of copying them.
+    """
+
+    __slots__ = ("_items", "_index")
+
+    def __init__(self, items: Sequence[str], index: array):
+        self._items = items
+        self._index = index
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return _IndexView(self._items, self._index[i])
+        return self._items[self._index[i]]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __iter__(self) -> Iterator[str]:
+        items = self._items
+        return (items[i] for i in self._index)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+def assign_folds(
+    dataset: RelationalDataset,
+    k: int = 5,
+    *,
+    stratify: bool = True,
+    group_by_entity: bool = False,
+    seed: Optional[int] = 0,
+) -> Tuple[array, array]:
+    """Assign each positive and negative example to one of ``k`` folds.
+
+    Arguments:
+        dataset: Examples to split.
+        k: Number of folds.
+        stratify: Split positives and negatives separately, so every fold has
+            about the same ratio of positive to negative examples.
+        group_by_entity: Keep examples with the same first argument (e.g.
+            every `advisedby(alice,...)` example) in the same fold.
+        seed: Seed for the random number generator.
+
+    Returns:
+        Integer arrays holding the fold (`0` to `k - 1`) of each positive and
+        each negative example.
+
+    Raises:
+        ValueError: If ``k`` is smaller than two.
+    """
+    if k < 2:
+        raise ValueError(f"k should be at least 2, not {k}")
+
+    rng = random.Random(seed)
+    examples = [("pos", i) for i in range(len(dataset.pos))]
+    examples += [("neg", i) for i in range(len(dataset.neg))]
+
+    if group_by_entity:
+        groups = {}  # type: Dict[str, List[Tuple[str, int]]]
+        for kind, i in examples:
+            entity = parse_atom(getattr(dataset, kind)[i])[1][0]
+            groups.setdefault(entity, []).append((kind, i))
+        buckets = list(groups.values())
+    else:
+        buckets = [[example] for example in examples]
+
+    if stratify:
+        strata = [
+            [bucket for bucket in buckets if bucket[0][0] == "pos"],
+            [bucket for bucket in buckets if bucket[0][0] == "neg"],
+        ]
+    else:
+        strata = [buckets]
+
+    assignments = {"pos": array("l", [0] * len(dataset.pos)), "neg": array("l", [0] * len(dataset.neg))}
+
+    for stratum in strata:
+        rng.shuffle(stratum)
+        # Place the largest groups first, each into the fold with the fewest
+        # examples so far. Without grouping this deals examples round-robin.
+        stratum.sort(key=len, reverse=True)
+        sizes = [0] * k
+        for bucket in stratum:
+            fold = min(range(k), key=sizes.__getitem__)
+            sizes[fold] += len(bucket)
+            for kind, i in bucket:
+                assignments[kind][i] = fold
+
+    return assignments["pos"], assignments["neg"]
+
+
+def kfold(
+    dataset: RelationalDataset,
+    k: int = 5,
+    *,
+    stratify: bool = True,
+    group_by_entity: bool = False,
+    seed: Optional[int] = 0,
+    path: Optional[str] = None,
+) -> Iterator[Tuple[RelationalDataset, RelationalDataset]]:
+    """Iterate over train/test splits for k-fold cross validation.
+
+    Folds are assigned once with `assign_folds`. The `pos` and `neg` lists of
+    each split are views indexing into the original lists, and `facts` is the
+    original list shared by both sides, so no strings are copied.
+
+    Arguments:
+        dataset: Examples and facts to split, e.g. the training set from `load`.
+        k: Number of folds.
+        stratify: Preserve the ratio of positive to negative examples.
+        group_by_entity: Keep examples with the same first argument in the
+            same fold.
+        seed: Seed for the random number generator.
+        path: A JSON file to store the fold assignments in. If it exists and
+            was made with the same settings for the same examples (compared
+            by their CRC-32), the saved assignments are reused.
+
+    Returns:
+        An iterator over `k` pairs of train and test sets.
+
+    Examples:
+
+    ```python
+    from relational_datasets import load
+    from relational_datasets.model_selection import kfold
+
+    train, _ = load("toy_cancer")
+
+    for fold_train, fold_test in kfold(train, 2, path="toy_cancer_folds.json"):
+        print(len(fold_train.pos), len(fold_test.pos))
+    # 2 2
+    # 2 2
+    ```
+    """
+    settings = {
+        "k": k,
+        "stratify": stratify,
+        "group_by_entity": group_by_entity,
+        "seed": seed,
+        "n_pos": len(dataset.pos),
+        "n_neg": len(dataset.neg),
+        "crc32": _fingerprint(dataset),
+    }
+
+    saved = _read_assignments(path, settings) if path else None
+    if saved:
+        pos_folds, neg_folds = saved
+    else:
+        pos_folds, neg_folds = assign_folds(
+            dataset, k, stratify=stratify, group_by_entity=group_by_entity, seed=seed
+        )
+        if path:
+            _write_assignments(path, settings, pos_folds, neg_folds)
+
+    for fold in range(k):
+        yield (
+            RelationalDataset(
+                pos=_IndexView(dataset.pos, array("l", (i for i, f in enumerate(pos_folds) if f != fold))),
+                neg=_IndexView(dataset.neg, array("l", (i for i, f in enumerate(neg_folds) if f != fold))),
+                facts=dataset.facts,
+            ),
+            RelationalDataset(
+                pos=_IndexView(dataset.pos, array("l", (i for i, f in enumerate(pos_folds) if f == fold))),
+                neg=_IndexView(dataset.neg, array("l", (i for i, f in enumerate(neg_folds) if f == fold))),
+                facts=dataset.facts,
+            ),
+        )
+
+
+def _fingerprint(dataset: RelationalDataset) -> str:
+    """CRC-32 of the positive and negative examples, in order."""
+    pos = crc32("\n".join(dataset.pos).encode("utf-8"))
+    neg = crc32("\n".join(dataset.neg).encode("utf-8"))
+    return f"{pos:08x}-{neg:08x}"
+
+
+def _read_assignments(path: str, settings: dict) -> Optional[Tuple[array, array]]:
+    """Saved fold assignments, if they were made with the same settings."""
+    saved = _read_json(path, {})
+    if saved.get("settings") != settings:
+        return None
+    return array("l", saved["pos"]), array("l", saved["neg"])
+
+
+def _write_assignments(path: str, settings: dict, pos_folds: array, neg_folds: array) -> None:
+    _write_json(path, {"settings": settings, "pos": pos_folds.tolist(), "neg": neg_folds.tolist()})
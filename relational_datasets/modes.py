@@ -0,0 +1,179 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Infer modes (argument types) from examples and facts.
+"""
+
+import pathlib
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from ._base import _archive_stamp
+from ._base import _read_json
+from ._base import _write_json
+from ._parse import parse_atom
+from .request import fetch
+from .request import load
+from .types import RelationalDataset
+
+__all__ = ["infer_modes", "load_modes"]
+
+# An argument position: (predicate, arity, index)
+_Slot = Tuple[str, int, int]
+
+
+class _UnionFind:
+    """Disjoint sets over the integers ``0, 1, 2, ...``, grown with `add`."""
+
+    def __init__(self):
+        self.parent = []  # type: List[int]
+
+    def add(self) -> int:
+        self.parent.append(len(self.parent))
+        return len(self.parent) - 1
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        i, j = self.find(i), self.find(j)
+        if i != j:
+            self.parent[max(i, j)] = min(i, j)
+
+
+def infer_modes(*datasets: RelationalDataset, target: Optional[str] = None) -> List[str]:
+    """Infer modes from the constants shared between argument positions.
+
+    Two argument positions have the same type when any constant appears in
+    both of them. This is computed in a single pass over the examples and
+    facts, merging positions with union-find.
+
+    Modes are returned in the format used by `from_numpy`:
+
+    - The first argument of every predicate is an input (`+`).
+    - Positions whose type occurs nowhere else (e.g. `v1_0`, `v1_1`, ...
+      only appear as the second argument of `v1`) are constants (`#`), with
+      the type name `var{predicate}`.
+    - Other positions are inputs (`+`) in the target, and outputs (`-`)
+      otherwise. Their types are named `type1`, `type2`, ...
+
+    Arguments:
+        datasets: One or more datasets, e.g. the train and test sets from `load`.
+        target: The target predicate. Defaults to the predicates in `pos` and `neg`.
+
+    Returns:
+        List of mode strings, with the target predicate(s) last.
+
+    Examples:
+
+    ```python
+    from relational_datasets import load
+    from relational_datasets.modes import infer_modes
+
+    train, test = load("toy_cancer")
+    infer_modes(train, test)
+    # ['friends(+type1,-type1).', 'smokes(+type1).', 'cancer(+type1).']
+    ```
+    """
+    sets = _UnionFind()
+    slots = {}  # type: Dict[_Slot, int]
+    constants = {}  # type: Dict[str, int]
+    targets = {}  # type: Dict[str, None]
+
+    def _visit(line: str, example: bool) -> None:
+        predicate, args = parse_atom(line)
+        if predicate == "regressionExample":
+            predicate, args = parse_atom(args[0])
+        if example and target is None:
+            targets[predicate] = None
+        arity = len(args)
+        for i, constant in enumerate(args):
+            key = (predicate, arity, i)
+            slot = slots.get(key)
+            if slot is None:
+                slot = slots[key] = sets.add()
+            seen = constants.setdefault(constant, slot)
+            if seen != slot:
+                sets.union(seen, slot)
+
+    for dataset in datasets:
+        for line in dataset.pos:
+            _visit(line, True)
+        for line in dataset.neg:
+            _visit(line, True)
+        for line in dataset.facts:
+            _visit(line, False)
+
+    if target is not None:
+        targets[target] = None
+
+    group_sizes = {}  # type: Dict[int, int]
+    for slot in slots.values():
+        root = sets.find(slot)
+        group_sizes[root] = group_sizes.get(root, 0) + 1
+
+    type_names = {}  # type: Dict[int, str]
+    predicates = {}  # type: Dict[Tuple[str, int], List[str]]
+
+    for (predicate, arity, i), slot in slots.items():
+        root = sets.find(slot)
+        if i > 0 and group_sizes[root] == 1:
+            mode = f"#var{predicate}"
+        else:
+            if root not in type_names:
+                type_names[root] = f"type{len(type_names) + 1}"
+            if i == 0 or predicate in targets:
+                mode = "+" + type_names[root]
+            else:
+                mode = "-" + type_names[root]
+        predicates.setdefault((predicate, arity), [""] * arity)[i] = mode
+
+    ordered = [key for key in predicates if key[0] not in targets]
+    ordered += [key for key in predicates if key[0] in targets]
+
+    return [f"{predicate}({','.join(predicates[(predicate, arity)])})." for predicate, arity in ordered]
+
+
+def load_modes(
+    name: str,
+    version: Optional[str] = None,
+    *,
+    fold: int = 1,
+    target: Optional[str] = None,
+) -> List[str]:
+    """Infer modes for a dataset, caching the result next to the archive.
+
+    Modes are inferred from the train and test sets of a fold with
+    `infer_modes`, and saved to `{name}_{version}.modes.json` in the data
+    home. The cache is invalidated if the archive changes.
+
+    Arguments:
+        name: Dataset name (e.g. `nell_sports`)
+        version: Dataset version (e.g. `v0.0.6`)
+        fold: In datasets with multiple folds, infer modes for this fold.
+        target: The target predicate, see `infer_modes`.
+
+    Returns:
+        List of mode strings.
+    """
+    data_file = pathlib.Path(fetch(name, version))
+    cache_file = data_file.with_suffix(".modes.json")
+    stamp = _archive_stamp(data_file)
+    key = f"fold={fold},target={target}"
+
+    cache = _read_json(cache_file, {})
+    if cache.get("archive") != stamp:
+        cache = {"archive": stamp, "modes": {}}
+
+    if key not in cache["modes"]:
+        train, test = load(name, version, fold=fold)
+        cache["modes"][key] = infer_modes(train, test, target=target)
+        _write_json(cache_file, cache)
+
+    return cache["modes"][key]
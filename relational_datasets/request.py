@@ -7,6 +7,8 @@
 # TODO(hayesall): Modes. Where do I put them, how do I store them?
 #   A more-general "schema" would be helpful. Plus it would probably be
 #   cleaner if I separated advice about structure, types, and search procedures.
+#   For now `modes.load_modes` infers types from the data and caches them
+#   next to each archive.
 
 # TODO(hayesall): `load` could be made iterable with a generator expression.
 #   Possibly useful for iterating over all folds, e.g. for cross validation.
@@ -15,18 +17,32 @@
 #   when a user cannot modify the parameter in the `_make_file_path`
 #   function.
 
+from contextlib import contextmanager
 from io import BytesIO
-from io import TextIOWrapper
-import json
 import logging
+import os
 import pathlib
+import shutil
+import tempfile
+import time
 from urllib.request import urlopen
 from zipfile import ZipFile
+from zlib import crc32
+from typing import BinaryIO
+from typing import Iterator
+from typing import List
 from typing import Tuple
 from typing import Optional
+from typing import Union
 
 
+from ._base import _archive_stamp
+from ._base import _read_json
+from ._base import _write_json
 from ._base import get_data_home
+from .archive import DirectoryReader
+from .archive import _preferred_location
+from .archive import open_archive
 from .types import RelationalDataset
 
 
@@ -55,43 +71,51 @@ DATASETS = [
 ]
 LATEST_VERSION = "v0.0.6"
 
+# Written into directories created by `fetch(..., extract=True)` once
+# extraction has finished.
+EXTRACTED_MARKER = ".relational_datasets.json"
 
-def latest_version() -> str:
-    """Get the latest ``srlearn/datasets`` version from GitHub's REST API.
 
-    !!! danger end
-        GitHub's REST API is limited to 60 requests per hour when an OAuth
-        token is not passed. This function is included for convenience, but
-        should only be used interactively.
+def latest_version(*, refresh: bool = False) -> str:
+    """Get the latest ``srlearn/datasets`` version.
+
+    The version is read from the local [catalog](catalog.md), which is
+    revalidated with GitHub's REST API at most once a day. If GitHub cannot
+    be reached, the last known version is returned.
 
-        Usually you'll be better looking at the latest version from your browser,
-        see the [Releases Page](https://github.com/srlearn/datasets/tags).
+    !!! note end
+        GitHub's REST API is limited to 60 requests per hour when an OAuth
+        token is not passed. The catalog uses conditional requests, which do
+        not count against this limit when nothing has changed.
 
         Read more on the
         [GitHub REST API Authentication](https://docs.github.com/en/rest/guides/getting-started-with-the-rest-api#authentication).
 
+    Arguments:
+        refresh: Revalidate the catalog now instead of waiting for it to expire.
+
     Returns:
         The latest version of datasets stored in the
         [`srlearn/datasets`](https://github.com/srlearn/datasets/) repository.
 
+    Raises:
+        urllib.error.URLError: With ``refresh=True``, if GitHub cannot be reached.
+
     Examples:
 
     ```python
     from relational_datasets.request import latest_version
     latest_version()
-    # 'v0.0.3'
+    # 'v0.0.6'
     ```
     """
+    from .catalog import get_catalog
 
-    with urlopen(
-        "https://api.github.com/repos/srlearn/datasets/releases/latest"
-    ) as url:
-        api_response = json.loads(url.read().decode("utf-8"))
-    return api_response["tag_name"]
+    return get_catalog(refresh=refresh)["latest"]
 
 
 def deserialize_zipfile(
-    data_location: str, name: str, *, fold: int = 1
+    data_location: Union[str, os.PathLike, BinaryIO], name: str, *, fold: int = 1
 ) -> Tuple[RelationalDataset, RelationalDataset]:
     """Deserialize a zipfile, returning train and test sets.
 
@@ -130,7 +154,9 @@ def deserialize_zipfile(
         ```
 
     Arguments:
-        data_location: Location of a zipfile.
+        data_location: Location of a zipfile (or a file object), or of an
+            archive in another format that `archive.open_archive` supports
+            (e.g. `.tar.zst`).
         name: Name of the dataset.
         fold: In datasets with multiple folds, return this fold. This value is
             ignored if the data is not split into multiple folds.
@@ -165,54 +191,130 @@ def deserialize_zipfile(
     ```
     """
 
-    with ZipFile(data_location) as myzip:
-
-        folds = _n_folds(myzip)
-
-        if folds == 0:
-            # This dataset contains no folds.
-
-            with myzip.open(f"{name}/train/train_pos.txt", "r") as _fh:
-                train_pos = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/train/train_neg.txt", "r") as _fh:
-                train_neg = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/train/train_facts.txt", "r") as _fh:
-                train_facts = TextIOWrapper(_fh).read().splitlines()
-
-            with myzip.open(f"{name}/test/test_pos.txt", "r") as _fh:
-                test_pos = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/test/test_neg.txt", "r") as _fh:
-                test_neg = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/test/test_facts.txt", "r") as _fh:
-                test_facts = TextIOWrapper(_fh).read().splitlines()
-
-        elif fold > folds:
-            print(fold, folds)
-            raise ValueError("Fold does not exist.")
-
-        else:
-            with myzip.open(f"{name}/fold{fold}/train/train_pos.txt", "r") as _fh:
-                train_pos = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/fold{fold}/train/train_neg.txt", "r") as _fh:
-                train_neg = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/fold{fold}/train/train_facts.txt", "r") as _fh:
-                train_facts = TextIOWrapper(_fh).read().splitlines()
-
-            with myzip.open(f"{name}/fold{fold}/test/test_pos.txt", "r") as _fh:
-                test_pos = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/fold{fold}/test/test_neg.txt", "r") as _fh:
-                test_neg = TextIOWrapper(_fh).read().splitlines()
-            with myzip.open(f"{name}/fold{fold}/test/test_facts.txt", "r") as _fh:
-                test_facts = TextIOWrapper(_fh).read().splitlines()
-
-    return (
-        RelationalDataset._make([train_pos, train_neg, train_facts]),
-        RelationalDataset._make([test_pos, test_neg, test_facts]),
+    with open_archive(data_location) as archive:
+        return _deserialize(archive, name, fold=fold)
+
+
+def deserialize_directory(
+    data_location: str, name: str, *, fold: int = 1
+) -> Tuple[RelationalDataset, RelationalDataset]:
+    """Deserialize an extracted archive, returning train and test sets.
+
+    This reads the same layout described in
+    [`deserialize_zipfile`](request.deserialize_zipfile.md), but from plain
+    files on disk. Directories are usually created with
+    `fetch(name, version, extract=True)`, where reading uncompressed files
+    avoids inflating the archive on every call.
+
+    Arguments:
+        data_location: Location of a directory containing an extracted archive.
+        name: Name of the dataset.
+        fold: In datasets with multiple folds, return this fold. This value is
+            ignored if the data is not split into multiple folds.
+
+    Returns:
+        Tuple of training and test sets.
+
+    Examples:
+
+    ```python
+    from relational_datasets.request import deserialize_directory
+
+    train, test = deserialize_directory(
+        '/home/user/relational_datasets/cora_v0.0.6',
+        'cora',
+        fold=2,
     )
+    ```
+    """
+    return _deserialize(DirectoryReader(data_location), name, fold=fold)
+
+
+def _deserialize(
+    archive,
+    name: str,
+    *,
+    fold: int = 1,
+    shard: Optional[Tuple[int, int]] = None,
+    shard_strategy: str = "contiguous",
+    shard_facts: bool = False,
+) -> Tuple[RelationalDataset, RelationalDataset]:
+    """Read train and test sets from an `archive.ArchiveReader` (or any
+    object providing ``namelist()`` and ``open(member, "r")``, such as a
+    ``ZipFile``).
+    """
+
+    prefix = _member_prefix(archive, name, fold=fold)
+
+    if shard is None:
+        examples = facts = None
+    else:
+        index, count = shard
+        if not 0 <= index < count:
+            raise ValueError(f"Shard {index} does not exist when there are {count} shards.")
+        if shard_strategy not in ("contiguous", "hash"):
+            raise ValueError(f"Unknown shard_strategy: {shard_strategy}")
+        examples = (index, count, shard_strategy)
+        facts = (index, count, "hash") if shard_facts else None
+
+    datasets = []
+    for split in ("train", "test"):
+        with archive.open(f"{prefix}/{split}/{split}_pos.txt", "r") as _fh:
+            pos = _read_lines(_fh, examples)
+        with archive.open(f"{prefix}/{split}/{split}_neg.txt", "r") as _fh:
+            neg = _read_lines(_fh, examples)
+        with archive.open(f"{prefix}/{split}/{split}_facts.txt", "r") as _fh:
+            facts_ = _read_lines(_fh, facts)
+        datasets.append(RelationalDataset._make([pos, neg, facts_]))
+
+    return datasets[0], datasets[1]
+
+
+def _read_lines(_fh: BinaryIO, shard: Optional[Tuple[int, int, str]] = None) -> List[str]:
+    """Read lines from a member, decoding only those assigned to ``shard``.
+
+    ``shard`` is ``(index, count, strategy)``. The ``contiguous`` strategy
+    assigns each shard an equal run of lines, and ``hash`` assigns a line by
+    the CRC-32 of its first argument, so that every example and fact about an
+    entity lands in the same shard.
+    """
+    # Lines are split before decoding, so only `\n`, `\r`, and `\r\n` end a
+    # line, whether or not the member is sharded.
+    lines = _fh.read().splitlines()
+
+    if shard is None:
+        return [line.decode("utf-8") for line in lines]
+
+    index, count, strategy = shard
+    if strategy == "contiguous":
+        selected = lines[len(lines) * index // count : len(lines) * (index + 1) // count]
+    else:
+        selected = [line for line in lines if crc32(_first_argument(line)) % count == index]
+
+    return [line.decode("utf-8") for line in selected]
+
+
+def _first_argument(line: bytes) -> bytes:
+    """Innermost first argument of an atom, e.g. ``alice`` from
+    ``friends(alice,bob).`` or ``id1`` from ``regressionExample(v4(id1),0.1).``
+    """
+    end = len(line)
+    for delimiter in (b",", b")"):
+        position = line.find(delimiter)
+        if position != -1 and position < end:
+            end = position
+    return line[line.rfind(b"(", 0, end) + 1 : end].strip()
 
 
 def load(
-    name: str, version: Optional[str] = None, *, fold: int = 1
+    name: str,
+    version: Optional[str] = None,
+    *,
+    fold: int = 1,
+    extract: bool = False,
+    shard: Optional[Tuple[int, int]] = None,
+    shard_strategy: str = "contiguous",
+    shard_facts: bool = False,
 ) -> Tuple[RelationalDataset, RelationalDataset]:
     """Get train/test instances of a dataset
 
@@ -221,6 +323,17 @@ def load(
         version: Dataset version (e.g. `v0.0.3`)
         fold: In datasets with multiple folds, return this fold. This value is
             ignored if the data is not split into multiple folds.
+        extract: Extract the archive once into the cache (see `fetch`) and
+            read from plain files instead of the zipfile.
+        shard: A pair `(i, n)` to return only the `i`-th of `n` disjoint
+            partitions of the positive and negative examples, for example in
+            one of `n` data-parallel workers. Lines outside the shard are
+            never decoded.
+        shard_strategy: `contiguous` splits examples into `n` runs in file
+            order. `hash` assigns examples by a stable hash of their first
+            argument (usually the entity).
+        shard_facts: Also partition facts by a stable hash of their first
+            argument. By default every shard receives all facts.
 
     Returns:
         Returns the training and test.
@@ -228,6 +341,7 @@ def load(
     Raises:
         urllib.error.URLError: If the data is not in the cache and cannot be
             downloaded, a failed request will raise this exception.
+        ValueError: If the fold or shard does not exist.
 
     Examples:
 
@@ -239,12 +353,29 @@ def load(
     >>> train.pos
     ['cancer(alice).', 'cancer(bob).', 'cancer(chuck).', 'cancer(fred).']
     ```
-    """
-    data_location = fetch(name, version)
-    return deserialize_zipfile(data_location, name=name, fold=fold)
 
+    Load the second of four shards, keeping examples and facts about the
+    same entity together:
 
-def fetch(name: str, version: Optional[str] = None) -> str:
+    ```python
+    >>> train, test = load("cora", shard=(1, 4), shard_strategy="hash", shard_facts=True)
+    ```
+    """
+    data_location = fetch(name, version, extract=extract)
+    if not extract:
+        data_location = _preferred_location(data_location)
+    with open_archive(data_location) as archive:
+        return _deserialize(
+            archive,
+            name,
+            fold=fold,
+            shard=shard,
+            shard_strategy=shard_strategy,
+            shard_facts=shard_facts,
+        )
+
+
+def fetch(name: str, version: Optional[str] = None, *, extract: bool = False) -> str:
     """Get a dataset with a name/version. Return path to a zipfile.
 
     Something else.
@@ -252,6 +383,10 @@ def fetch(name: str, version: Optional[str] = None) -> str:
     Arguments:
         name: Dataset name, usually lowercase with underscores.
         version: Dataset version. Downloads a default (`v0.0.3`) if not provided.
+        extract: Also extract the zipfile once into a directory next to it
+            (e.g. `toy_cancer_v0.0.6/`) and return the directory instead.
+            Extraction is skipped on later calls while the directory's
+            validity marker still matches the zipfile.
 
     Returns:
         A string representing the path to the downloaded dataset. For example:
@@ -281,22 +416,110 @@ def fetch(name: str, version: Optional[str] = None) -> str:
 
     # TODO(hayesall): This logic might be moved into the same function.
     data_file = _make_file_path(name, version)
-    if data_file.is_file():
-        return str(data_file)
 
-    # Else the data needs to be downloaded.
+    if not data_file.is_file():
+        # The data needs to be downloaded.
+
+        download_url = _make_data_url(name, version)
 
-    download_url = _make_data_url(name, version)
+        with urlopen(download_url) as url:
+            data = BytesIO(url.read())
 
-    with urlopen(download_url) as url:
-        data = BytesIO(url.read())
+        with open(data_file, "wb") as _fh:
+            _fh.write(data.getbuffer())
 
-    with open(data_file, "wb") as _fh:
-        _fh.write(data.getbuffer())
+    if extract:
+        return str(_extract(data_file))
 
     return str(data_file)
 
 
+# Seconds after which a lock left behind by a crashed process is ignored.
+_LOCK_TIMEOUT = 10 * 60
+
+
+@contextmanager
+def _lock(path: pathlib.Path) -> Iterator[None]:
+    """Hold an exclusive lock file, waiting for other processes to release it."""
+    while True:
+        try:
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(path) > _LOCK_TIMEOUT:
+                    os.remove(path)
+            except OSError:
+                pass
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _extract(data_file: pathlib.Path) -> pathlib.Path:
+    """Extract ``data_file`` into a sibling directory with the same stem.
+
+    A marker recording the size and modification time of the zipfile is
+    written last, so a directory without a matching marker (an interrupted
+    extraction, or a zipfile that was downloaded again) is extracted again.
+
+    Concurrent calls (e.g. one per worker) extract once: the first call holds
+    a lock file while it extracts and replaces an outdated directory, and the
+    others wait for it, then find a matching marker. The marker is checked
+    again while holding the lock, so a complete directory is never removed.
+    """
+    target = data_file.with_suffix("")
+    marker = {"archive": data_file.name, "stamp": _archive_stamp(data_file)}
+
+    if _is_extracted(target, marker):
+        return target
+
+    with _lock(target.with_name(target.name + ".lock")):
+        if _is_extracted(target, marker):
+            return target
+
+        partial = pathlib.Path(
+            tempfile.mkdtemp(prefix=target.name + ".", suffix=".partial", dir=data_file.parent)
+        )
+        try:
+            with ZipFile(data_file) as myzip:
+                myzip.extractall(partial)
+            _write_json(partial.joinpath(EXTRACTED_MARKER), marker)
+
+            if target.exists():
+                # An outdated extraction: move it aside before removing it.
+                stale = partial.with_suffix(".stale")
+                os.rename(target, stale)
+                shutil.rmtree(stale, ignore_errors=True)
+            os.rename(partial, target)
+        finally:
+            shutil.rmtree(partial, ignore_errors=True)
+
+    return target
+
+
+def _is_extracted(target: pathlib.Path, marker: dict) -> bool:
+    """Is ``target`` a complete extraction of the archive described by ``marker``?"""
+    return _read_json(target.joinpath(EXTRACTED_MARKER)) == marker
+
+
+def _member_prefix(archive, name: str, *, fold: int = 1) -> str:
+    """Directory holding the ``train`` and ``test`` members for a fold."""
+
+    folds = _n_folds(archive)
+
+    if folds and fold > folds:
+        print(fold, folds)
+        raise ValueError("Fold does not exist.")
+
+    return f"{name}/fold{fold}" if folds else name
+
+
 def _make_file_path(name: str, version: Optional[str] = "") -> pathlib.Path:
     """Create a file path where data are stored.
 
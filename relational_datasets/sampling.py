@@ -0,0 +1,230 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Subsample or generate negative examples without materializing them.
+"""
+
+from io import TextIOWrapper
+from itertools import islice
+from itertools import product
+import math
+import random
+from typing import Iterable
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TypeVar
+
+from ._parse import format_atom
+from ._parse import parse_atom
+from .archive import _preferred_location
+from .archive import open_archive
+from .request import _member_prefix
+from .request import fetch
+
+__all__ = ["reservoir_sample", "sample_negatives", "generate_negatives"]
+
+T = TypeVar("T")
+
+
+def reservoir_sample(items: Iterable[T], k: int, *, seed: Optional[int] = 0) -> List[T]:
+    """Uniformly sample ``k`` items from an iterable in a single pass.
+
+    This uses Li's "Algorithm L", which skips over runs of items instead of
+    drawing a random number for each one. At most ``k`` items are held in
+    memory, and the sample keeps the order items appeared in.
+
+    Arguments:
+        items: Any iterable, such as lines streamed from a file.
+        k: Number of items to keep. If there are fewer than ``k`` items, all
+            of them are returned.
+        seed: Seed for the random number generator.
+
+    Returns:
+        List of at most ``k`` items.
+
+    Examples:
+
+    ```python
+    from relational_datasets.sampling import reservoir_sample
+
+    reservoir_sample(range(100), 3, seed=1)
+    # [2, 59, 94]
+    ```
+    """
+    if k <= 0:
+        return []
+
+    rng = random.Random(seed)
+    iterator = enumerate(items)
+    reservoir = list(islice(iterator, k))
+    if len(reservoir) < k:
+        return [item for _, item in reservoir]
+
+    w = math.exp(math.log(rng.random()) / k)
+    while True:
+        skip = int(math.log(rng.random()) / math.log(1 - w))
+        chosen = next(islice(iterator, skip, None), None)
+        if chosen is None:
+            break
+        reservoir[rng.randrange(k)] = chosen
+        w *= math.exp(math.log(rng.random()) / k)
+
+    reservoir.sort(key=lambda pair: pair[0])
+    return [item for _, item in reservoir]
+
+
+def sample_negatives(
+    name: str,
+    version: Optional[str] = None,
+    *,
+    ratio: float = 1.0,
+    fold: int = 1,
+    split: str = "train",
+    seed: Optional[int] = 0,
+    extract: bool = False,
+) -> List[str]:
+    """Sample negative examples at a fixed ratio to the positive examples.
+
+    Negatives are streamed from the archive and passed through
+    `reservoir_sample`, so only the sampled lines are kept in memory.
+
+    Arguments:
+        name: Dataset name (e.g. `webkb`)
+        version: Dataset version (e.g. `v0.0.6`)
+        ratio: Number of negatives to keep for each positive example.
+        fold: In datasets with multiple folds, sample from this fold.
+        split: Either `train` or `test`.
+        seed: Seed for the random number generator.
+        extract: Read from an extracted archive, see `fetch`.
+
+    Returns:
+        List of negative examples, in the order they appear in the archive.
+
+    Examples:
+
+    Keep two negatives for every positive in the webkb training set:
+
+    ```python
+    from relational_datasets.sampling import sample_negatives
+
+    neg = sample_negatives("webkb", "v0.0.6", ratio=2.0)
+    ```
+    """
+    if split not in ("train", "test"):
+        raise ValueError(f"split must be 'train' or 'test', not {split!r}")
+
+    data_location = fetch(name, version, extract=extract)
+    if not extract:
+        data_location = _preferred_location(data_location)
+    with open_archive(data_location) as archive:
+        prefix = _member_prefix(archive, name, fold=fold)
+
+        with archive.open(f"{prefix}/{split}/{split}_pos.txt", "r") as _fh:
+            n_pos = sum(1 for _ in _fh)
+
+        with archive.open(f"{prefix}/{split}/{split}_neg.txt", "r") as _fh:
+            lines = (line.rstrip("\r\n") for line in TextIOWrapper(_fh, encoding="utf-8"))
+            return reservoir_sample(lines, round(ratio * n_pos), seed=seed)
+
+
+def generate_negatives(
+    pos: Iterable[str],
+    *,
+    target: Optional[str] = None,
+    facts: Iterable[str] = (),
+    constants: Optional[Iterable[str]] = None,
+    n: Optional[int] = None,
+    seed: Optional[int] = 0,
+) -> Iterator[str]:
+    """Generate closed-world negative examples for a target predicate.
+
+    Any grounding of the target over the constant domain that is not a
+    positive example is a negative example. Positives are kept in a hashed
+    set for membership tests, and negatives are produced lazily.
+
+    Arguments:
+        pos: Positive examples.
+        target: Target predicate. May be omitted when ``pos`` contains a
+            single predicate.
+        facts: Facts contributing constants to the domain.
+        constants: The constant domain. Defaults to every constant that
+            appears in ``pos`` or ``facts``.
+        n: Number of negatives to sample uniformly at random. When `None`,
+            every negative is generated in a deterministic order.
+        seed: Seed for the random number generator, used when ``n`` is set.
+
+    Returns:
+        An iterator over negative examples.
+
+    Raises:
+        ValueError: If the target cannot be determined.
+
+    Examples:
+
+    ```python
+    from relational_datasets.sampling import generate_negatives
+
+    list(generate_negatives(
+        ["cancer(alice)."],
+        facts=["friends(alice,bob).", "friends(bob,chuck)."],
+    ))
+    # ['cancer(bob).', 'cancer(chuck).']
+    ```
+    """
+    positives = set()
+    domain = {}
+    arity = None
+    infer_target = target is None
+
+    for line in pos:
+        predicate, args = parse_atom(line)
+        if target is None:
+            target = predicate
+        elif predicate != target:
+            if not infer_target:
+                continue
+            raise ValueError(
+                f"Examples contain several predicates ({target}, {predicate}), set `target`."
+            )
+        arity = len(args)
+        positives.add(args)
+        domain.update(dict.fromkeys(args))
+
+    if target is None or arity is None:
+        raise ValueError("Could not find positive examples for the target.")
+
+    if constants is not None:
+        domain = dict.fromkeys(constants)
+    else:
+        for line in facts:
+            domain.update(dict.fromkeys(parse_atom(line)[1]))
+
+    domain_list = list(domain)
+    total = len(domain_list) ** arity - sum(
+        1 for args in positives if all(arg in domain for arg in args)
+    )
+
+    negatives = (
+        format_atom(target, args)
+        for args in product(domain_list, repeat=arity)
+        if args not in positives
+    )
+    if n is None or n >= total:
+        return negatives
+    if 2 * n > total:
+        # Rejection sampling slows down as the domain runs out of negatives.
+        return iter(reservoir_sample(negatives, n, seed=seed))
+    return _sample_groundings(target, domain_list, arity, positives, n, seed)
+
+
+def _sample_groundings(target, domain, arity, positives, n, seed) -> Iterator[str]:
+    """Rejection sampling of ``n`` distinct groundings not in ``positives``."""
+    rng = random.Random(seed)
+    seen = set()
+    while len(seen) < n:
+        args = tuple(rng.choice(domain) for _ in range(arity))
+        if args in positives or args in seen:
+            continue
+        seen.add(args)
+        yield format_atom(target, args)
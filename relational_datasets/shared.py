@@ -0,0 +1,189 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Share a loaded dataset with worker processes through shared memory.
+
+!!! note end
+    This module requires Python 3.8 or later for `multiprocessing.shared_memory`.
+"""
+
+from array import array
+from multiprocessing.shared_memory import SharedMemory
+import sys
+from typing import Iterator
+from typing import Sequence
+from typing import Tuple
+
+from .types import RelationalDataset
+
+__all__ = ["publish", "SharedDataset"]
+
+_OFFSET = "q"
+_OFFSET_SIZE = 8
+
+
+class _SharedMemory(SharedMemory):
+    """Tolerates strings from `SharedDataset.attach` outliving the segment
+    object, e.g. during interpreter shutdown.
+    """
+
+    def __del__(self):
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+class _PackedStrings(Sequence[str]):
+    """A read-only list of strings decoded on access from a packed buffer."""
+
+    __slots__ = ("_offsets", "_data", "_shm")
+
+    def __init__(self, offsets: memoryview, data: memoryview, shm: SharedMemory):
+        self._offsets = offsets
+        self._data = data
+        # Keep the segment open for as long as the strings are reachable.
+        self._shm = shm
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("index out of range")
+        return str(self._data[self._offsets[i] : self._offsets[i + 1]], "utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        offsets, data = self._offsets, self._data
+        for i in range(len(offsets) - 1):
+            yield str(data[offsets[i] : offsets[i + 1]], "utf-8")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class SharedDataset:
+    """Handle to a `RelationalDataset` published with `publish`.
+
+    Pickling a handle (for example by passing it to a worker pool) only sends
+    the name of the shared memory segment and the number of strings in each
+    field. Workers call `attach` to read the dataset without copying it.
+
+    The process that called `publish` owns the segment, and should call
+    `unlink` (or use the handle as a context manager) when workers are done.
+    """
+
+    def __init__(self, name: str, counts: Tuple[int, int, int], *, _shm: SharedMemory = None):
+        self.name = name
+        self.counts = counts
+        self._shm = _shm
+
+    def __reduce__(self):
+        return (SharedDataset, (self.name, self.counts))
+
+    def __repr__(self) -> str:
+        return f"SharedDataset(name={self.name!r}, counts={self.counts!r})"
+
+    def attach(self) -> RelationalDataset:
+        """Return a read-only `RelationalDataset` backed by shared memory.
+
+        Each field is a sequence that decodes strings from the shared buffer
+        when they are accessed.
+        """
+        if self._shm is None:
+            if sys.version_info >= (3, 13):
+                # Workers do not own the segment, so should not clean it up.
+                self._shm = _SharedMemory(self.name, track=False)
+            else:
+                self._shm = _SharedMemory(self.name)
+
+        buffer = self._shm.buf.toreadonly()
+        n_offsets = sum(self.counts) + len(self.counts)
+        offsets = buffer[: n_offsets * _OFFSET_SIZE].cast(_OFFSET)
+        data = buffer[n_offsets * _OFFSET_SIZE :]
+
+        fields = []
+        start = 0
+        for count in self.counts:
+            fields.append(_PackedStrings(offsets[start : start + count + 1], data, self._shm))
+            start += count + 1
+        return RelationalDataset._make(fields)
+
+    def close(self) -> None:
+        """Stop using the segment in this process."""
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                # Strings from `attach` are still reachable. The segment is
+                # released when they are garbage collected.
+                pass
+
+    def unlink(self) -> None:
+        """Free the segment. Only the publishing process should call this."""
+        shm = self._shm if self._shm is not None else _SharedMemory(self.name)
+        self.close()
+        shm.unlink()
+
+    def __enter__(self) -> "SharedDataset":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.unlink()
+
+
+def publish(dataset: RelationalDataset) -> SharedDataset:
+    """Copy a dataset into one shared memory segment.
+
+    The segment holds the UTF-8 bytes of every string, preceded by an array
+    of byte offsets for each field.
+
+    Arguments:
+        dataset: The dataset to share, e.g. the training set from `load`.
+
+    Returns:
+        A small, picklable handle to the shared dataset.
+
+    Examples:
+
+    ```python
+    from concurrent.futures import ProcessPoolExecutor
+    from relational_datasets import load
+    from relational_datasets.shared import publish
+
+    def count_facts(handle):
+        return len(handle.attach().facts)
+
+    train, _ = load("cora")
+
+    with publish(train) as handle:
+        with ProcessPoolExecutor() as pool:
+            print(list(pool.map(count_facts, [handle] * 4)))
+    ```
+    """
+    encoded = [[line.encode("utf-8") for line in field] for field in dataset]
+    counts = tuple(len(field) for field in encoded)
+
+    offsets = []
+    total = 0
+    for field in encoded:
+        offsets.append(total)
+        for line in field:
+            total += len(line)
+            offsets.append(total)
+
+    header = len(offsets) * _OFFSET_SIZE
+    shm = _SharedMemory(create=True, size=max(header + total, 1))
+    shm.buf[:header].cast(_OFFSET)[:] = array(_OFFSET, offsets)
+    shm.buf[header : header + total] = b"".join(line for field in encoded for line in field)
+
+    return SharedDataset(shm.name, counts, _shm=shm)
@@ -0,0 +1,235 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Deduplicated storage for archive members shared across dataset versions.
+
+Most members (e.g. `train_facts.txt`) do not change between releases. This
+stores each distinct member once, uncompressed, under its SHA-256 digest,
+and records which members make up a version in a small JSON manifest:
+
+```
+~/relational_datasets/store/
+├── objects
+│   ├── 3f
+│   │   └── 3f2a...
+│   └── ...
+├── manifests
+│   ├── cora_v0.0.5.json
+│   └── cora_v0.0.6.json
+└── index.json
+```
+"""
+
+import hashlib
+import os
+import pathlib
+from typing import BinaryIO
+from typing import Dict
+from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
+from zipfile import ZipFile
+from zipfile import ZipInfo
+
+from ._base import _read_json
+from ._base import _write_json
+from ._base import get_data_home
+from .archive import ArchiveReader
+from .archive import _LOCAL_HEADER
+from .request import _deserialize
+from .request import _make_file_path
+from .request import fetch
+from .types import RelationalDataset
+
+__all__ = ["deduplicate", "load", "usage", "StoreUsage"]
+
+_CHUNK_SIZE = 1 << 20
+
+
+StoreUsage = NamedTuple(
+    "StoreUsage",
+    [
+        ("versions", int),
+        ("archive_bytes", int),
+        ("member_bytes", int),
+        ("stored_bytes", int),
+    ],
+)
+StoreUsage.__doc__ = """Disk usage of the deduplicated store, returned by `usage`.
+
+`member_bytes - stored_bytes` is the space saved by deduplication, and
+`archive_bytes` is the size of the zipfiles the manifests were created from.
+"""
+
+
+def _store_home() -> pathlib.Path:
+    return pathlib.Path(get_data_home()).joinpath("store")
+
+
+def _object_path(digest: str) -> pathlib.Path:
+    return _store_home().joinpath("objects", digest[:2], digest)
+
+
+def _manifest_path(name: str, version: Optional[str] = None) -> pathlib.Path:
+    return _store_home().joinpath("manifests", _make_file_path(name, version).stem + ".json")
+
+
+def deduplicate(
+    name: str, version: Optional[str] = None, *, remove_archive: bool = False
+) -> str:
+    """Add a dataset version to the deduplicated store.
+
+    Members already in the store are recognized without decompressing them
+    again: by the SHA-256 of their *compressed* bytes, with the compression
+    method, CRC-32, and size. A member that was compressed differently than
+    before is decompressed and hashed, and is still stored only once.
+
+    Arguments:
+        name: Dataset name (e.g. `cora`)
+        version: Dataset version (e.g. `v0.0.6`)
+        remove_archive: Delete the cached zipfile afterwards.
+
+    Returns:
+        Path to the manifest for this version.
+
+    Examples:
+
+    ```python
+    from relational_datasets import store
+
+    for version in ["v0.0.4", "v0.0.5", "v0.0.6"]:
+        store.deduplicate("cora", version, remove_archive=True)
+
+    print(store.usage())
+    ```
+    """
+    manifest_path = _manifest_path(name, version)
+    if not manifest_path.is_file():
+        _add_manifest(manifest_path, fetch(name, version))
+
+    data_file = _make_file_path(name, version)
+    if remove_archive and data_file.is_file():
+        os.remove(data_file)
+
+    return str(manifest_path)
+
+
+def _add_manifest(manifest_path: pathlib.Path, data_location: str) -> None:
+    """Store the members of a zipfile and write its manifest."""
+    index_path = _store_home().joinpath("index.json")
+    index = _read_json(index_path, {})
+
+    members = {}
+    sizes = {}
+    with ZipFile(data_location) as myzip, open(data_location, "rb") as raw:
+        for info in myzip.infolist():
+            if info.is_dir():
+                continue
+            key = f"{info.compress_type}-{info.CRC:08x}-{info.file_size}-{_compressed_digest(raw, info)}"
+            digest = index.get(key)
+            if digest is None or not _object_path(digest).is_file():
+                with myzip.open(info) as _fh:
+                    digest = _write_object(_fh)
+                index[key] = digest
+            members[info.filename] = digest
+            sizes[info.filename] = info.file_size
+
+    manifest = {
+        "archive": os.path.basename(data_location),
+        "archive_size": os.path.getsize(data_location),
+        "members": members,
+        "sizes": sizes,
+    }
+    _write_json(index_path, index)
+    _write_json(manifest_path, manifest)
+
+
+def load(
+    name: str, version: Optional[str] = None, *, fold: int = 1
+) -> Tuple[RelationalDataset, RelationalDataset]:
+    """Get train/test instances of a dataset from the deduplicated store.
+
+    This behaves like [`load`](request.load.md), but reads uncompressed
+    members through the version's manifest. The version is added to the store
+    first if necessary.
+
+    Arguments:
+        name: Dataset name (e.g. `cora`)
+        version: Dataset version (e.g. `v0.0.6`)
+        fold: In datasets with multiple folds, return this fold.
+
+    Returns:
+        Returns the training and test.
+    """
+    manifest_path = _manifest_path(name, version)
+    if not manifest_path.is_file():
+        deduplicate(name, version)
+    return _deserialize(_StoredArchive(manifest_path), name, fold=fold)
+
+
+def usage() -> StoreUsage:
+    """Report how much space the deduplicated store uses and saves."""
+    manifests = sorted(_store_home().joinpath("manifests").glob("*.json"))
+
+    archive_bytes = member_bytes = 0
+    for path in manifests:
+        manifest = _read_json(path, {})
+        archive_bytes += manifest["archive_size"]
+        member_bytes += sum(manifest["sizes"].values())
+
+    stored_bytes = sum(
+        path.stat().st_size
+        for path in _store_home().joinpath("objects").glob("*/*")
+        if path.is_file()
+    )
+
+    return StoreUsage(len(manifests), archive_bytes, member_bytes, stored_bytes)
+
+
+class _StoredArchive(ArchiveReader):
+    """Read the members listed in a manifest."""
+
+    def __init__(self, manifest_path: pathlib.Path):
+        self.members = _read_json(manifest_path, {})["members"]  # type: Dict[str, str]
+
+    def namelist(self) -> List[str]:
+        return list(self.members)
+
+    def open(self, member: str, mode: str = "r") -> BinaryIO:
+        return open(_object_path(self.members[member]), mode + "b")
+
+
+def _compressed_digest(raw: BinaryIO, info: ZipInfo) -> str:
+    """SHA-256 of a member's bytes as they are stored in the zipfile."""
+    raw.seek(info.header_offset)
+    header = _LOCAL_HEADER.unpack(raw.read(_LOCAL_HEADER.size))
+    raw.seek(header[-2] + header[-1], os.SEEK_CUR)
+
+    digest = hashlib.sha256()
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = raw.read(min(remaining, _CHUNK_SIZE))
+        if not chunk:
+            break
+        digest.update(chunk)
+        remaining -= len(chunk)
+    return digest.hexdigest()
+
+
+def _write_object(_fh: BinaryIO) -> str:
+    """Copy a stream into the store, returning its digest."""
+    objects = _store_home().joinpath("objects")
+    objects.mkdir(parents=True, exist_ok=True)
+
+    digest = hashlib.sha256()
+    partial = objects.joinpath(f".partial-{os.getpid()}")
+    with open(partial, "wb") as _out:
+        for chunk in iter(lambda: _fh.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            _out.write(chunk)
+
+    path = _object_path(digest.hexdigest())
+    path.parent.mkdir(exist_ok=True)
+    os.replace(partial, path)
+    return digest.hexdigest()
@@ -0,0 +1,86 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Fixtures that write small archives into a temporary data home, so tests
+do not need to download anything.
+"""
+
+from zipfile import ZipFile
+from zipfile import ZIP_DEFLATED
+
+import pytest
+
+TRAIN = {
+    "pos": ["cancer(alice).", "cancer(bob).", "cancer(chuck).", "cancer(fred)."],
+    "neg": ["cancer(dan).", "cancer(earl)."],
+    "facts": [
+        "friends(alice,bob).",
+        "friends(alice,fred).",
+        "friends(chuck,bob).",
+        "friends(chuck,fred).",
+        "friends(dan,bob).",
+        "friends(earl,bob).",
+        "friends(bob,alice).",
+        "friends(fred,alice).",
+        "friends(bob,chuck).",
+        "friends(fred,chuck).",
+        "friends(bob,dan).",
+        "friends(bob,earl).",
+        "smokes(alice).",
+        "smokes(chuck).",
+        "smokes(bob).",
+    ],
+}
+TEST = {
+    "pos": ["cancer(zod).", "cancer(xena).", "cancer(yoda)."],
+    "neg": ["cancer(voldemort).", "cancer(watson)."],
+    "facts": [
+        "friends(zod,xena).",
+        "friends(xena,watson).",
+        "friends(watson,voldemort).",
+        "friends(voldemort,yoda).",
+        "friends(yoda,zod).",
+        "friends(xena,zod).",
+        "friends(watson,xena).",
+        "friends(voldemort,watson).",
+        "friends(yoda,voldemort).",
+        "friends(zod,yoda).",
+        "smokes(zod).",
+        "smokes(xena).",
+        "smokes(yoda).",
+    ],
+}
+
+
+def write_archive(path, name, *, folds=0, compression=ZIP_DEFLATED):
+    """Write ``TRAIN``/``TEST`` into a zipfile with the `srlearn/datasets` layout."""
+    prefixes = [f"{name}/fold{i}" for i in range(1, folds + 1)] if folds else [name]
+    with ZipFile(path, "w", compression=compression) as myzip:
+        myzip.writestr(f"{name}/README.md", f"# {name}\n")
+        for prefix in prefixes:
+            for split, data in (("train", TRAIN), ("test", TEST)):
+                for kind in ("pos", "neg", "facts"):
+                    myzip.writestr(
+                        f"{prefix}/{split}/{split}_{kind}.txt",
+                        "\n".join(data[kind]) + "\n",
+                    )
+    return str(path)
+
+
+@pytest.fixture
+def data_home(tmp_path, monkeypatch):
+    """Point ``get_data_home`` at an empty temporary directory."""
+    monkeypatch.setenv("RELATIONAL_DATASETS", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def toy_archive(data_home):
+    """A cached ``toy_cancer_v0.0.6.zip`` with a single train/test split."""
+    return write_archive(data_home / "toy_cancer_v0.0.6.zip", "toy_cancer")
+
+
+@pytest.fixture
+def folded_archive(data_home):
+    """A cached ``webkb_v0.0.6.zip`` with two folds."""
+    return write_archive(data_home / "webkb_v0.0.6.zip", "webkb", folds=2)
@@ -0,0 +1,139 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for archive readers and re-packing.
+"""
+
+from io import BytesIO
+import pathlib
+from zipfile import ZIP_STORED
+from zipfile import ZipFile
+
+import pytest
+
+from relational_datasets import load
+from relational_datasets.archive import READERS
+from relational_datasets.archive import ArchiveReader
+from relational_datasets.archive import ZipReader
+from relational_datasets.archive import _preferred_location
+from relational_datasets.archive import benchmark
+from relational_datasets.archive import open_archive
+from relational_datasets.archive import register_reader
+from relational_datasets.archive import repack
+from relational_datasets.request import deserialize_zipfile
+
+from .conftest import write_archive
+
+
+def test_stored_zip_matches_deflate(tmp_path):
+    deflated = write_archive(tmp_path / "deflated.zip", "webkb", folds=2)
+    stored = write_archive(tmp_path / "stored.zip", "webkb", folds=2, compression=ZIP_STORED)
+    for fold in (1, 2):
+        assert deserialize_zipfile(stored, "webkb", fold=fold) == deserialize_zipfile(
+            deflated, "webkb", fold=fold
+        )
+
+
+def test_zip_reader_reads_stored_members_from_mmap(tmp_path):
+    stored = write_archive(tmp_path / "stored.zip", "toy_cancer", compression=ZIP_STORED)
+    with ZipReader(stored) as archive, ZipFile(stored) as myzip:
+        for member in archive.namelist():
+            with archive.open(member) as _fh:
+                assert _fh.read() == myzip.read(member)
+        assert archive._mmap is not None
+    assert archive._mmap is None
+
+
+@pytest.mark.parametrize("format", ["deflate", "stored"])
+def test_repack_zip_in_place(toy_archive, format):
+    expected = load("toy_cancer", "v0.0.6")
+    assert repack(toy_archive, format) == toy_archive
+    with ZipFile(toy_archive) as myzip:
+        compression = {"deflate": 8, "stored": 0}[format]
+        assert {info.compress_type for info in myzip.infolist()} == {compression}
+    assert load("toy_cancer", "v0.0.6") == expected
+
+
+def test_repack_zstd_is_preferred_by_load(toy_archive):
+    pytest.importorskip("zstandard")
+    expected = load("toy_cancer", "v0.0.6")
+
+    packed = repack(toy_archive, "zstd")
+    assert packed.endswith("toy_cancer_v0.0.6.tar.zst")
+    assert pathlib.Path(toy_archive).is_file()
+
+    assert _preferred_location(toy_archive) == packed
+    assert load("toy_cancer", "v0.0.6") == expected
+
+    # Re-packing to a zip format removes the `.tar.zst` again.
+    repack(toy_archive, "stored")
+    assert not pathlib.Path(packed).exists()
+    assert not pathlib.Path(packed + ".json").exists()
+
+
+def test_outdated_zstd_is_ignored(toy_archive):
+    pytest.importorskip("zstandard")
+    packed = repack(toy_archive, "zstd")
+
+    # Download a new zipfile with different contents.
+    with ZipFile(toy_archive, "w") as myzip:
+        for split in ("train", "test"):
+            for kind in ("pos", "neg", "facts"):
+                myzip.writestr(f"toy_cancer/{split}/{split}_{kind}.txt", "cancer(zed).\n")
+
+    assert _preferred_location(toy_archive) == toy_archive
+    train, _ = load("toy_cancer", "v0.0.6")
+    assert train.pos == ["cancer(zed)."]
+    assert pathlib.Path(packed).is_file()
+
+
+def test_repack_chooses_a_format(toy_archive):
+    expected = load("toy_cancer", "v0.0.6")
+    packed = repack(toy_archive)
+    with open_archive(packed) as archive:
+        assert "toy_cancer/train/train_pos.txt" in archive.namelist()
+    assert load("toy_cancer", "v0.0.6") == expected
+
+
+def test_benchmark(toy_archive):
+    results = benchmark(toy_archive, formats=["deflate", "stored"], repeat=1)
+    assert set(results) == {"deflate", "stored"}
+    assert all(rate > 0 for rate in results.values())
+
+
+def test_unknown_format(toy_archive):
+    with pytest.raises(ValueError):
+        repack(toy_archive, "rar")
+
+
+def test_register_reader(tmp_path):
+    class ListReader(ArchiveReader):
+        def __init__(self, data_location):
+            self.data_location = data_location
+
+        def namelist(self):
+            return ["a.txt"]
+
+    register_reader(".list", ListReader)
+    try:
+        with open_archive(str(tmp_path / "data.LIST")) as archive:
+            assert archive.namelist() == ["a.txt"]
+    finally:
+        del READERS[".list"]
+
+
+@pytest.mark.parametrize("filename", ["custom.ZIP", "custom_data"])
+def test_zipfiles_with_other_suffixes(tmp_path, filename):
+    expected = deserialize_zipfile(write_archive(tmp_path / "data.zip", "toy_cancer"), "toy_cancer")
+    path = write_archive(tmp_path / filename, "toy_cancer", compression=ZIP_STORED)
+    assert deserialize_zipfile(path, "toy_cancer") == expected
+    assert deserialize_zipfile(pathlib.Path(path), "toy_cancer") == expected
+
+
+def test_zipfile_objects(tmp_path):
+    path = write_archive(tmp_path / "data.zip", "toy_cancer", compression=ZIP_STORED)
+    expected = deserialize_zipfile(path, "toy_cancer")
+    with open(path, "rb") as _fh:
+        buffer = BytesIO(_fh.read())
+        assert deserialize_zipfile(_fh, "toy_cancer") == expected
+    assert deserialize_zipfile(buffer, "toy_cancer") == expected
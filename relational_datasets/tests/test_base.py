@@ -1,11 +1,37 @@
 # Copyright © 2021 Alexander L. Hayes
 # Apache 2.0 License
 
+import os
 from os.path import expanduser
 from os.path import join
 from relational_datasets import get_data_home
+from relational_datasets._base import _archive_stamp
+from relational_datasets._base import _read_json
+from relational_datasets._base import _write_json
 
 
 def test_default_data_home():
     dir = get_data_home()
     assert dir == expanduser(join("~", "relational_datasets"))
+
+
+def test_archive_stamp_changes_with_file(tmp_path):
+    path = tmp_path / "data.zip"
+    path.write_bytes(b"abc")
+    stamp = _archive_stamp(path)
+    assert _archive_stamp(str(path)) == stamp
+
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    assert _archive_stamp(path) != stamp
+
+
+def test_json_round_trip(tmp_path):
+    path = tmp_path / "cache" / "data.json"
+    assert _read_json(path, {}) == {}
+    _write_json(path, {"a": [1, 2]})
+    assert _read_json(path) == {"a": [1, 2]}
+    assert os.listdir(path.parent) == ["data.json"]
+
+    path.write_text("{")
+    assert _read_json(path) is None
@@ -0,0 +1,136 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the local `catalog`, with GitHub's API replaced by stubs.
+"""
+
+from email.message import Message
+import json
+from urllib.error import HTTPError
+from urllib.error import URLError
+
+import pytest
+
+from relational_datasets import catalog
+from relational_datasets import latest_version
+from relational_datasets.request import LATEST_VERSION
+
+RELEASES = [
+    {
+        "tag_name": "v0.0.5",
+        "published_at": "2021-11-30T00:00:00Z",
+        "assets": [
+            {"name": "cora_v0.0.5.zip", "size": 10, "browser_download_url": "https://example.com/cora_v0.0.5.zip"},
+        ],
+    },
+    {
+        "tag_name": "v0.0.6",
+        "published_at": "2022-11-03T00:00:00Z",
+        "assets": [
+            {"name": "cora_v0.0.6.zip", "size": 20, "browser_download_url": "https://example.com/cora_v0.0.6.zip"},
+            {"name": "toy_cancer_v0.0.6.zip", "size": 5, "browser_download_url": "https://example.com/t.zip"},
+        ],
+    },
+]
+
+
+class _Response:
+    def __init__(self, body, etag):
+        self.body = json.dumps(body).encode("utf-8")
+        self.headers = Message()
+        self.headers["ETag"] = etag
+
+    def read(self):
+        return self.body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.fixture
+def github(monkeypatch):
+    """Record requests, and answer them with `github.responses`."""
+
+    class GitHub:
+        requests = []
+        responses = []
+
+    def _urlopen(request, timeout=None):
+        GitHub.requests.append(request)
+        response = GitHub.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(catalog, "urlopen", _urlopen)
+    return GitHub
+
+
+def test_catalog_cached_until_ttl(data_home, github):
+    github.responses = [_Response(RELEASES, '"abc"')]
+
+    assert latest_version() == "v0.0.6"
+    assert catalog.list_versions() == ["v0.0.6", "v0.0.5"]
+    assert catalog.list_datasets() == ["cora", "toy_cancer"]
+    assert catalog.get_catalog()["releases"]["v0.0.5"]["assets"]["cora"]["size"] == 10
+    assert len(github.requests) == 1
+
+
+def test_catalog_revalidates_with_etag(data_home, github):
+    not_modified = HTTPError(catalog.RELEASES_URL, 304, "Not Modified", Message(), None)
+    github.responses = [_Response(RELEASES, '"abc"'), not_modified]
+
+    catalog.get_catalog()
+    assert catalog.get_catalog(ttl=0)["latest"] == "v0.0.6"
+    assert github.requests[1].get_header("If-none-match") == '"abc"'
+
+
+def test_catalog_offline(data_home, github):
+    github.responses = [URLError("offline"), _Response(RELEASES, '"abc"'), URLError("offline")]
+
+    # Without a local catalog, fall back to the versions known to this package.
+    assert catalog.get_catalog()["latest"] == LATEST_VERSION
+    assert "cora" in catalog.list_datasets()
+    assert len(github.requests) == 1
+
+    assert catalog.get_catalog(refresh=True)["releases"]["v0.0.5"]
+    assert catalog.get_catalog(ttl=0)["releases"]["v0.0.5"]
+
+
+@pytest.mark.parametrize(
+    "error",
+    [URLError("offline"), HTTPError(catalog.RELEASES_URL, 403, "Forbidden", Message(), None)],
+)
+def test_catalog_backs_off_after_failure(data_home, github, monkeypatch, error):
+    github.responses = [_Response(RELEASES, '"abc"'), error, _Response(RELEASES, '"def"')]
+    catalog.get_catalog()
+
+    # A stale catalog is kept, and GitHub is not asked again until `RETRY_AFTER`.
+    assert catalog.get_catalog(ttl=0)["latest"] == "v0.0.6"
+    assert catalog.get_catalog(ttl=0)["latest"] == "v0.0.6"
+    assert len(github.requests) == 2
+
+    now = catalog.time.time()
+    monkeypatch.setattr(catalog.time, "time", lambda: now + catalog.RETRY_AFTER + 1)
+    assert catalog.get_catalog(ttl=0)["etag"] == '"def"'
+    assert "failed_at" not in catalog.get_catalog()
+
+
+def test_catalog_refresh_raises(data_home, github):
+    forbidden = HTTPError(catalog.RELEASES_URL, 403, "Forbidden", Message(), None)
+    github.responses = [_Response(RELEASES, '"abc"'), forbidden, URLError("offline")]
+    catalog.get_catalog()
+
+    with pytest.raises(HTTPError):
+        catalog.get_catalog(refresh=True)
+    with pytest.raises(URLError):
+        latest_version(refresh=True)
+
+
+def test_n_folds_remembered(folded_archive, data_home):
+    assert catalog.n_folds("webkb", "v0.0.6") == 2
+    with open(data_home / "catalog.json") as _fh:
+        assert json.load(_fh)["folds"] == {"webkb_v0.0.6": 2}
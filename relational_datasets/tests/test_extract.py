@@ -0,0 +1,134 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for loading from extracted archives.
+"""
+
+import json
+import multiprocessing
+import os
+import pathlib
+
+import pytest
+
+from relational_datasets import fetch
+from relational_datasets import load
+from relational_datasets.request import EXTRACTED_MARKER
+from relational_datasets import request
+from relational_datasets.request import deserialize_zipfile
+
+from .conftest import write_archive
+
+
+def test_fetch_extract_creates_directory(toy_archive):
+    location = fetch("toy_cancer", "v0.0.6", extract=True)
+    assert location == toy_archive[: -len(".zip")]
+    assert pathlib.Path(location).joinpath("toy_cancer/train/train_pos.txt").is_file()
+    assert pathlib.Path(location).joinpath(EXTRACTED_MARKER).is_file()
+
+
+def test_load_extract_matches_zipfile(toy_archive):
+    assert load("toy_cancer", "v0.0.6", extract=True) == deserialize_zipfile(
+        toy_archive, "toy_cancer"
+    )
+
+
+def test_load_extract_folds(folded_archive):
+    train, _ = load("webkb", "v0.0.6", fold=2, extract=True)
+    assert train == deserialize_zipfile(folded_archive, "webkb", fold=2)[0]
+    with pytest.raises(ValueError):
+        load("webkb", "v0.0.6", fold=3, extract=True)
+
+
+def test_extract_reused_until_archive_changes(toy_archive):
+    location = pathlib.Path(fetch("toy_cancer", "v0.0.6", extract=True))
+    location.joinpath("toy_cancer/train/train_pos.txt").write_text("cancer(zed).\n")
+
+    train, _ = load("toy_cancer", "v0.0.6", extract=True)
+    assert train.pos == ["cancer(zed)."]
+
+    # Touching the zipfile invalidates the marker, so the directory is rebuilt.
+    stat = os.stat(toy_archive)
+    os.utime(toy_archive, (stat.st_atime, stat.st_mtime + 10))
+    train, _ = load("toy_cancer", "v0.0.6", extract=True)
+    assert train.pos[0] == "cancer(alice)."
+
+    with open(location.joinpath(EXTRACTED_MARKER)) as _fh:
+        assert json.load(_fh)["archive"] == "toy_cancer_v0.0.6.zip"
+
+
+def _load_shard(index):
+    return load("toy_cancer", "v0.0.6", extract=True, shard=(index, 4))
+
+
+def test_concurrent_extract(data_home):
+    write_archive(data_home / "toy_cancer_v0.0.6.zip", "toy_cancer")
+    with multiprocessing.Pool(4) as pool:
+        shards = pool.map(_load_shard, range(4))
+
+    expected, _ = load("toy_cancer", "v0.0.6")
+    assert sorted(line for train, _ in shards for line in train.pos) == sorted(expected.pos)
+    assert sorted(path.name for path in data_home.iterdir()) == [
+        "toy_cancer_v0.0.6",
+        "toy_cancer_v0.0.6.zip",
+    ]
+
+
+def test_extract_replaces_outdated_directory(toy_archive):
+    location = pathlib.Path(fetch("toy_cancer", "v0.0.6", extract=True))
+    location.joinpath(EXTRACTED_MARKER).write_text("{}")
+    location.joinpath("stale.txt").write_text("")
+
+    assert fetch("toy_cancer", "v0.0.6", extract=True) == str(location)
+    assert not location.joinpath("stale.txt").exists()
+    assert sorted(path.name for path in location.parent.iterdir()) == [
+        "toy_cancer_v0.0.6",
+        "toy_cancer_v0.0.6.zip",
+    ]
+
+
+def test_concurrent_extract_replaces_outdated_directory(toy_archive, data_home):
+    fetch("toy_cancer", "v0.0.6", extract=True)
+    stat = os.stat(toy_archive)
+    os.utime(toy_archive, (stat.st_atime, stat.st_mtime + 10))
+
+    with multiprocessing.Pool(4) as pool:
+        shards = pool.map(_load_shard, range(4))
+
+    expected, _ = load("toy_cancer", "v0.0.6")
+    assert sorted(line for train, _ in shards for line in train.pos) == sorted(expected.pos)
+    assert sorted(path.name for path in data_home.iterdir()) == [
+        "toy_cancer_v0.0.6",
+        "toy_cancer_v0.0.6.zip",
+    ]
+
+
+def test_extract_keeps_directory_completed_by_another_process(toy_archive, monkeypatch):
+    location = pathlib.Path(fetch("toy_cancer", "v0.0.6", extract=True))
+    inode = os.stat(location).st_ino
+
+    # This process saw an outdated marker, then another process finished
+    # extracting before this one took the lock.
+    checks = []
+
+    def _is_extracted(target, marker):
+        checks.append(target)
+        return len(checks) > 1 and request._read_json(target.joinpath(EXTRACTED_MARKER)) == marker
+
+    monkeypatch.setattr(request, "_is_extracted", _is_extracted)
+    with open(location.joinpath("toy_cancer/train/train_pos.txt")) as _fh:
+        assert fetch("toy_cancer", "v0.0.6", extract=True) == str(location)
+        assert _fh.readline() == "cancer(alice).\n"
+    assert len(checks) == 2
+    assert os.stat(location).st_ino == inode
+    assert location.joinpath("toy_cancer/train/train_neg.txt").is_file()
+
+
+def test_extract_ignores_abandoned_lock(toy_archive):
+    lock = pathlib.Path(toy_archive[: -len(".zip")] + ".lock")
+    lock.touch()
+    os.utime(lock, (0, 0))
+
+    location = fetch("toy_cancer", "v0.0.6", extract=True)
+    assert pathlib.Path(location).joinpath(EXTRACTED_MARKER).is_file()
+    assert not lock.exists()
@@ -0,0 +1,46 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the `graph` module
+"""
+
+import pytest
+
+numpy = pytest.importorskip("numpy")
+
+from relational_datasets.graph import load_graph
+from relational_datasets.graph import to_graph
+
+
+def test_to_graph_csr_arrays():
+    graph = to_graph(["cites(a,b).", "cites(c,a).", "cites(a,c).", "smokes(a).", "link(b,c)."])
+    assert graph.constants == ["a", "b", "c"]
+    assert graph.indptr["cites"].tolist() == [0, 2, 2, 3]
+    assert graph.indices["cites"].tolist() == [1, 2, 0]
+    assert graph.indptr["link"].tolist() == [0, 0, 1, 1]
+    assert graph.indices["link"].tolist() == [2]
+
+
+def test_to_graph_predicates():
+    graph = to_graph(["cites(a,b).", "link(b,c)."], predicates=["link"])
+    assert graph.constants == ["b", "c"]
+    assert list(graph.indptr) == ["link"]
+
+
+def test_to_scipy():
+    pytest.importorskip("scipy")
+    graph = to_graph(["cites(a,b).", "cites(c,a)."])
+    assert graph.to_scipy()["cites"].toarray().tolist() == [[0, 1, 0], [0, 0, 0], [1, 0, 0]]
+
+
+def test_load_graph_cached(toy_archive, data_home):
+    graph = load_graph("toy_cancer", "v0.0.6")
+    assert (data_home / "toy_cancer_v0.0.6.fold1.train.graph.npz").is_file()
+    assert graph.indices["friends"].size == 12
+
+    cached = load_graph("toy_cancer", "v0.0.6", predicates=["friends"])
+    assert cached.constants == graph.constants
+    assert numpy.array_equal(cached.indptr["friends"], graph.indptr["friends"])
+
+    test_graph = load_graph("toy_cancer", "v0.0.6", split="test")
+    assert "zod" in test_graph.constants
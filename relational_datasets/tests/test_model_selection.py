@@ -0,0 +1,82 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the `model_selection` module
+"""
+
+import json
+from zlib import crc32
+
+import pytest
+
+from relational_datasets.model_selection import assign_folds
+from relational_datasets.model_selection import kfold
+from relational_datasets.types import RelationalDataset
+
+from .conftest import TRAIN
+
+DATA = RelationalDataset(**TRAIN)
+
+
+def test_kfold_partitions_examples():
+    splits = list(kfold(DATA, 2))
+    assert len(splits) == 2
+    for train, test in splits:
+        assert sorted(list(train.pos) + list(test.pos)) == sorted(DATA.pos)
+        assert sorted(list(train.neg) + list(test.neg)) == sorted(DATA.neg)
+        assert train.facts is DATA.facts
+        assert test.facts is DATA.facts
+        # Stratified: each fold has two positives and one negative.
+        assert (len(test.pos), len(test.neg)) == (2, 1)
+    assert sorted(list(splits[0][1].pos) + list(splits[1][1].pos)) == sorted(DATA.pos)
+
+
+def test_kfold_views_share_strings():
+    train, _ = next(kfold(DATA, 2))
+    assert all(any(a is b for b in DATA.pos) for a in train.pos)
+    assert train.pos[0] == list(train.pos)[0]
+    assert train.pos[:1] == [train.pos[0]]
+
+
+def test_assign_folds_group_by_entity():
+    data = RelationalDataset(
+        pos=["advisedby(a,x).", "advisedby(a,y).", "advisedby(b,x).", "advisedby(c,y)."],
+        neg=["advisedby(a,z).", "advisedby(d,x)."],
+        facts=[],
+    )
+    pos_folds, neg_folds = assign_folds(data, 2, stratify=False, group_by_entity=True)
+    assert pos_folds[0] == pos_folds[1] == neg_folds[0]
+
+
+def test_kfold_persists_assignments(tmp_path):
+    path = str(tmp_path / "folds.json")
+    first = [test.pos for _, test in kfold(DATA, 2, seed=1, path=path)]
+
+    with open(path) as _fh:
+        saved = json.load(_fh)
+    saved["pos"] = [1 - f for f in saved["pos"]]
+    with open(path, "w") as _fh:
+        json.dump(saved, _fh)
+
+    # The (modified) saved assignments are used instead of recomputing them.
+    second = [test.pos for _, test in kfold(DATA, 2, seed=1, path=path)]
+    assert first == second[::-1]
+
+
+def test_kfold_saved_assignments_match_examples(tmp_path):
+    path = str(tmp_path / "folds.json")
+    list(kfold(DATA, 2, seed=1, path=path))
+
+    # Same counts, different examples: the assignments are made again.
+    other = DATA._replace(pos=[line.replace("cancer", "smokes") for line in DATA.pos])
+    splits = list(kfold(other, 2, seed=1, path=path))
+    assert sorted(p for _, test in splits for p in test.pos) == sorted(other.pos)
+    with open(path) as _fh:
+        assert json.load(_fh)["settings"]["crc32"].startswith(
+            "%08x" % crc32("\n".join(other.pos).encode("utf-8"))
+        )
+
+
+def test_kfold_invalid_k():
+    with pytest.raises(ValueError):
+        list(kfold(DATA, 1))
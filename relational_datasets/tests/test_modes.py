@@ -0,0 +1,60 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the `modes` module
+"""
+
+import json
+
+from relational_datasets.modes import infer_modes
+from relational_datasets.modes import load_modes
+from relational_datasets.types import RelationalDataset
+
+from .conftest import TEST
+from .conftest import TRAIN
+
+
+def test_infer_modes_toy_cancer():
+    modes = infer_modes(RelationalDataset(**TRAIN), RelationalDataset(**TEST))
+    assert modes == ["friends(+type1,-type1).", "smokes(+type1).", "cancer(+type1)."]
+
+
+def test_infer_modes_separates_types():
+    data = RelationalDataset(
+        pos=["advisedby(alice,bob)."],
+        neg=["advisedby(bob,carol)."],
+        facts=[
+            "publication(paper1,alice).",
+            "publication(paper2,bob).",
+            "inphase(alice,phase_post_quals).",
+            "inphase(carol,phase_prelim).",
+        ],
+    )
+    assert infer_modes(data) == [
+        "publication(+type2,-type1).",
+        "inphase(+type1,#varinphase).",
+        "advisedby(+type1,+type1).",
+    ]
+
+
+def test_infer_modes_regression_examples():
+    data = RelationalDataset(
+        pos=["regressionExample(price(h1),0.5).", "regressionExample(price(h2),0.7)."],
+        neg=[],
+        facts=["rooms(h1,rooms_3).", "rooms(h2,rooms_4)."],
+    )
+    assert infer_modes(data) == ["rooms(+type1,#varrooms).", "price(+type1)."]
+
+
+def test_load_modes_cached(toy_archive, data_home):
+    modes = load_modes("toy_cancer", "v0.0.6")
+    assert modes == ["friends(+type1,-type1).", "smokes(+type1).", "cancer(+type1)."]
+
+    cache_file = data_home / "toy_cancer_v0.0.6.modes.json"
+    with open(cache_file) as _fh:
+        cache = json.load(_fh)
+    cache["modes"]["fold=1,target=None"] = ["cached(+type1)."]
+    with open(cache_file, "w") as _fh:
+        json.dump(cache, _fh)
+
+    assert load_modes("toy_cancer", "v0.0.6") == ["cached(+type1)."]
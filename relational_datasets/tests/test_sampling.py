@@ -0,0 +1,74 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the `sampling` module
+"""
+
+import pytest
+
+from relational_datasets import sampling
+from relational_datasets.archive import open_archive
+from relational_datasets.archive import repack
+from relational_datasets.sampling import generate_negatives
+from relational_datasets.sampling import reservoir_sample
+from relational_datasets.sampling import sample_negatives
+
+
+def test_reservoir_sample_is_ordered_and_seeded():
+    sample = reservoir_sample(range(1000), 10, seed=3)
+    assert len(sample) == 10
+    assert sample == sorted(sample)
+    assert sample == reservoir_sample(iter(range(1000)), 10, seed=3)
+
+
+def test_reservoir_sample_short_input():
+    assert reservoir_sample(["a", "b"], 5) == ["a", "b"]
+    assert reservoir_sample(["a", "b"], 0) == []
+
+
+def test_sample_negatives_ratio(toy_archive):
+    neg = sample_negatives("toy_cancer", "v0.0.6", ratio=0.25)
+    assert len(neg) == 1
+    assert neg[0] in ["cancer(dan).", "cancer(earl)."]
+
+    neg = sample_negatives("toy_cancer", "v0.0.6", split="test", extract=True)
+    assert neg == ["cancer(voldemort).", "cancer(watson)."]
+
+
+def test_sample_negatives_reads_repacked_archive(toy_archive, monkeypatch):
+    pytest.importorskip("zstandard")
+    packed = repack(toy_archive, "zstd")
+
+    opened = []
+
+    def _open_archive(data_location):
+        opened.append(data_location)
+        return open_archive(data_location)
+
+    monkeypatch.setattr(sampling, "open_archive", _open_archive)
+    neg = sample_negatives("toy_cancer", "v0.0.6", split="test")
+    assert neg == ["cancer(voldemort).", "cancer(watson)."]
+    assert opened == [packed]
+
+
+def test_generate_negatives_closed_world():
+    neg = generate_negatives(
+        ["cancer(alice).", "cancer(bob)."],
+        facts=["friends(alice,chuck).", "smokes(dan)."],
+    )
+    assert list(neg) == ["cancer(chuck).", "cancer(dan)."]
+
+
+def test_generate_negatives_sampled():
+    pos = ["advisedby(a,b).", "advisedby(b,c)."]
+    constants = [f"p{i}" for i in range(50)] + ["a", "b", "c"]
+    neg = list(generate_negatives(pos, constants=constants, n=20, seed=1))
+    assert len(set(neg)) == 20
+    assert not set(neg) & set(pos)
+    assert neg == list(generate_negatives(pos, constants=constants, n=20, seed=1))
+
+
+def test_generate_negatives_requires_target():
+    with pytest.raises(ValueError):
+        list(generate_negatives(["a(x).", "b(y)."]))
+    assert list(generate_negatives(["a(x).", "b(y)."], target="b")) == []
@@ -0,0 +1,68 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for loading shards of a dataset.
+"""
+
+from zipfile import ZipFile
+
+import pytest
+
+from relational_datasets import load
+
+
+@pytest.mark.parametrize("strategy", ["contiguous", "hash"])
+def test_shards_partition_examples(toy_archive, strategy):
+    full_train, full_test = load("toy_cancer", "v0.0.6")
+    shards = [load("toy_cancer", "v0.0.6", shard=(i, 3), shard_strategy=strategy) for i in range(3)]
+
+    for split, full in ((0, full_train), (1, full_test)):
+        for kind in ("pos", "neg"):
+            parts = [getattr(shard[split], kind) for shard in shards]
+            assert sorted(sum(parts, [])) == sorted(getattr(full, kind))
+        # Facts are shared unless `shard_facts` is set.
+        assert all(shard[split].facts == full.facts for shard in shards)
+
+
+def test_contiguous_shards_keep_order(toy_archive):
+    train, _ = load("toy_cancer", "v0.0.6", shard=(0, 2))
+    assert train.pos == ["cancer(alice).", "cancer(bob)."]
+
+
+def test_hash_shards_partition_facts_by_entity(toy_archive):
+    full, _ = load("toy_cancer", "v0.0.6")
+    shards = [
+        load("toy_cancer", "v0.0.6", shard=(i, 2), shard_strategy="hash", shard_facts=True)[0]
+        for i in range(2)
+    ]
+    assert sorted(shards[0].facts + shards[1].facts) == sorted(full.facts)
+
+    for shard in shards:
+        entities = {example[len("cancer("):-2] for example in shard.pos + shard.neg}
+        smokers = {fact[len("smokes("):-2] for fact in shard.facts if fact.startswith("smokes")}
+        assert smokers <= entities
+
+
+def test_invalid_shard(toy_archive):
+    with pytest.raises(ValueError):
+        load("toy_cancer", "v0.0.6", shard=(2, 2))
+    with pytest.raises(ValueError):
+        load("toy_cancer", "v0.0.6", shard=(0, 2), shard_strategy="random")
+
+
+@pytest.mark.parametrize("strategy", ["contiguous", "hash"])
+def test_shards_decode_utf8(data_home, strategy):
+    with ZipFile(data_home / "toy_cancer_v0.0.6.zip", "w") as myzip:
+        for split in ("train", "test"):
+            myzip.writestr(
+                f"toy_cancer/{split}/{split}_pos.txt",
+                "cancer(zoë).\ncancer(jürgen).\r\ncancer(a\u2028b).\ncancer(c\x0cd).\n",
+            )
+            myzip.writestr(f"toy_cancer/{split}/{split}_neg.txt", "cancer(åsa).\n")
+            myzip.writestr(f"toy_cancer/{split}/{split}_facts.txt", "smokes(zoë).\n")
+
+    full, _ = load("toy_cancer", "v0.0.6")
+    # Only `\n`, `\r`, and `\r\n` end a line, not other Unicode line breaks.
+    assert full.pos == ["cancer(zoë).", "cancer(jürgen).", "cancer(a\u2028b).", "cancer(c\x0cd)."]
+    shards = [load("toy_cancer", "v0.0.6", shard=(i, 3), shard_strategy=strategy)[0] for i in range(3)]
+    assert sorted(sum((shard.pos for shard in shards), [])) == sorted(full.pos)
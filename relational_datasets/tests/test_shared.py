@@ -0,0 +1,48 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for sharing datasets between processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import pickle
+
+import pytest
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+from relational_datasets.shared import publish
+from relational_datasets.types import RelationalDataset
+
+from .conftest import TRAIN
+
+DATA = RelationalDataset(**TRAIN)
+
+
+def _summarize(handle):
+    data = handle.attach()
+    return len(data.pos), data.neg[-1], list(data.facts)
+
+
+def test_publish_and_attach():
+    with publish(DATA) as handle:
+        attached = pickle.loads(pickle.dumps(handle)).attach()
+        assert attached == DATA
+        assert attached.facts[-1] == DATA.facts[-1]
+        assert attached.pos[1:3] == DATA.pos[1:3]
+        with pytest.raises(IndexError):
+            attached.neg[2]
+        # Attached datasets pickle like any other dataset.
+        assert pickle.loads(pickle.dumps(attached)) == DATA
+
+
+def test_publish_to_worker_pool():
+    with publish(DATA) as handle:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(_summarize, handle).result() == (4, "cancer(earl).", DATA.facts)
+
+
+def test_publish_empty_fields():
+    data = RelationalDataset(pos=["ünïcode(ä)."], neg=[], facts=[])
+    with publish(data) as handle:
+        assert handle.attach() == data
@@ -0,0 +1,75 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+"""Tests for the deduplicated `store`.
+"""
+
+from hashlib import sha256
+from zipfile import ZIP_STORED
+from zipfile import ZipFile
+from zlib import crc32
+
+from relational_datasets import load
+from relational_datasets import store
+
+from .conftest import write_archive
+
+
+def test_store_deduplicates_versions(data_home):
+    write_archive(data_home / "toy_cancer_v0.0.5.zip", "toy_cancer")
+    write_archive(data_home / "toy_cancer_v0.0.6.zip", "toy_cancer")
+    with ZipFile(data_home / "toy_cancer_v0.0.6.zip", "a") as myzip:
+        myzip.writestr("toy_cancer/background.txt", "mode: cancer(+person).\n")
+
+    expected = load("toy_cancer", "v0.0.6")
+    store.deduplicate("toy_cancer", "v0.0.5")
+    store.deduplicate("toy_cancer", "v0.0.6", remove_archive=True)
+
+    assert not (data_home / "toy_cancer_v0.0.6.zip").exists()
+    assert store.load("toy_cancer", "v0.0.6") == expected
+
+    report = store.usage()
+    assert report.versions == 2
+    objects = list((data_home / "store" / "objects").glob("*/*"))
+    # README, background, and six train/test members, shared by both versions.
+    assert len(objects) == 8
+    assert report.stored_bytes < report.member_bytes
+
+
+def test_store_load_adds_version(folded_archive):
+    train, test = store.load("webkb", "v0.0.6", fold=2)
+    assert (train, test) == load("webkb", "v0.0.6", fold=2)
+
+
+def _crc_collision():
+    """Two different lines with the same length and CRC-32."""
+    seen = {}
+    for i in range(1 << 20):
+        line = f"cancer(p{sha256(str(i).encode()).hexdigest()[:12]}).\n".encode()
+        other = seen.setdefault(crc32(line), line)
+        if other != line:
+            return other, line
+    raise AssertionError("No collision found.")
+
+
+def test_store_crc_collision(data_home):
+    first, second = _crc_collision()
+    for version, line in (("v0.0.5", first), ("v0.0.6", second)):
+        write_archive(data_home / f"toy_cancer_{version}.zip", "toy_cancer")
+        with ZipFile(data_home / f"toy_cancer_{version}.zip", "a") as myzip:
+            myzip.writestr("toy_cancer/extra.txt", line)
+
+    store.deduplicate("toy_cancer", "v0.0.5")
+    store.deduplicate("toy_cancer", "v0.0.6")
+    for version, line in (("v0.0.5", first), ("v0.0.6", second)):
+        with store._StoredArchive(store._manifest_path("toy_cancer", version)) as archive:
+            with archive.open("toy_cancer/extra.txt") as _fh:
+                assert _fh.read() == line
+
+
+def test_store_recompressed_members_stored_once(data_home):
+    write_archive(data_home / "toy_cancer_v0.0.5.zip", "toy_cancer")
+    write_archive(data_home / "toy_cancer_v0.0.6.zip", "toy_cancer", compression=ZIP_STORED)
+    store.deduplicate("toy_cancer", "v0.0.5")
+    store.deduplicate("toy_cancer", "v0.0.6")
+    assert len(list((data_home / "store" / "objects").glob("*/*"))) == 7
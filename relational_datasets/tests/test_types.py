@@ -0,0 +1,18 @@
+# Copyright © 2021 Alexander L. Hayes
+# Apache 2.0 License
+
+import copy
+import pickle
+
+from relational_datasets.types import RelationalDataset
+
+
+def test_pickle_relational_dataset():
+    data = RelationalDataset(pos=["a(b).", "a(c)."], neg=[], facts=["x(y).", ""])
+    assert pickle.loads(pickle.dumps(data)) == data
+    assert copy.deepcopy(data) == data
+
+
+def test_pickle_relational_dataset_with_newlines():
+    data = RelationalDataset(pos=["a(b).\nb(c)."], neg=[""], facts=[])
+    assert pickle.loads(pickle.dumps(data)) == data
@@ -39,8 +39,11 @@ setup(
         "Development Status :: 4 - Beta",
         "Topic :: Scientific/Engineering :: Artificial Intelligence",
     ],
-    extra_requires={
+    extras_require={
         "tests": ["coverage", "pytest"],
         "convert": ["numpy>=1.20.0"],
+        "pandas": ["numpy>=1.20.0", "pandas"],
+        "graph": ["numpy>=1.20.0", "scipy"],
+        "zstd": ["zstandard"],
     },
 )